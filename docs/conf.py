@@ -1,9 +1,7 @@
-import os
-import sys
 from datetime import datetime
 
-# Add project root to sys.path so Sphinx can find the package
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+# The API reference is generated by sphinx-autoapi, which parses the sources
+# statically, so the package and its heavy dependencies are never imported.
 
 project = "jmaps"
 author = "Helaman Flores"
@@ -12,14 +10,25 @@ copyright = f"{datetime.now().year}, {author}"
 extensions = [
     "sphinx.ext.duration",
     "sphinx.ext.doctest",
-    "sphinx.ext.autodoc",
-    "sphinx.ext.autosummary",
+    "autoapi.extension",
     "sphinx.ext.intersphinx",
     'sphinx.ext.napoleon',
 ]
 
 napoleon_google_docstring = True
 
+autoapi_dirs = ["../src/jmaps"]
+autoapi_options = [
+    "members",
+    "undoc-members",
+    "show-inheritance",
+    "special-members",
+]
+autoapi_member_order = "bysource"
+autoapi_keep_files = False
+# api.rst links the generated index into the navigation itself.
+autoapi_add_toctree_entry = False
+
 templates_path = ["_templates"]
 exclude_patterns = [
     "_build",
@@ -33,6 +42,9 @@ intersphinx_mapping = {
     "sphinx": ("https://www.sphinx-doc.org/en/master/", None),
 }
 intersphinx_disabled_domains = ["std"]
+# Sphinx >= 7 (see requirements.txt) already fetches these inventories
+# concurrently; bound each fetch so one slow host cannot stall the build.
+intersphinx_timeout = 10
 
 html_theme = "sphinx_rtd_theme"
 html_static_path = ["_static"]
@@ -48,27 +60,3 @@ html_sidebars = {
 }
 
 master_doc = "index"
-
-autodoc_mock_imports = [
-    "pmag",
-    "tidy3d",
-    "gplugins",
-    "gdstk",
-    "sqlalchemy",
-    "dill",
-    "numpy",
-    "matplotlib",
-]
-
-# Autodoc configuration
-autodoc_default_options = {
-    'members': True,
-    'member-order': 'bysource',
-    'special-members': '__init__',
-    'undoc-members': True,
-    'exclude-members': '__weakref__'
-}
-
-# Autosummary configuration
-autosummary_generate = True
-autosummary_imported_members = True
\ No newline at end of file
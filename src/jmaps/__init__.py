@@ -39,71 +39,73 @@ __forum_url__ = "https://github.com/Sephiram591/JourneyMAPS"
 __trouble_url__ = __project_url__ + "/wiki/Troubleshooting-Guide"
 __website_url__ = "https://camacholab.byu.edu/"
 
-# Public facade: expose the Journey API at the package root
-from .config import PATH
-from .journey import (
-    Journey,
-    PathOptions,
-    get_filename,
-    JBatch,
-    JPath,
-    PathResult,
-    REF_SEP,
-    ResetCondition,
-    JParam,
-    JValue,
-    InvisibleParam,
-    JDict,
-    Buffer,
-    YBuffer,
-    XBuffer,
-    Refer,
-    wrap_jparam,
-    Base,
-    get_sql_type,
-    cast_sql_type,
-    get_sql_schema,
-    create_tables,
-    DBPath,
-    DBPathVersion,
-    DBResult,
-    # register,
-    # serialize_default,
-    # deserialize,
-    # serializable,
-    # deserializable,
-)
+# Public facade: expose the Journey API at the package root. Names are imported
+# on first access (PEP 562), so ``import jmaps`` does not pull in SQLAlchemy,
+# pydantic or NumPy until they are needed.
+import importlib
 
-__all__ = [
-    "PATH",
-    "Journey",
-    "PathOptions",
-    "get_filename",
-    "JBatch",
-    "JPath",
-    "PathResult",
-    "REF_SEP",
-    "ResetCondition",
-    "JParam",
-    "JValue",
-    "InvisibleParam",
-    "JDict",
-    "Buffer",
-    "YBuffer",
-    "XBuffer",
-    "Refer",
-    "wrap_jparam",
-    "Base",
-    "get_sql_type",
-    "cast_sql_type",
-    "get_sql_schema",
-    "create_tables",
-    "DBPath",
-    "DBPathVersion",
-    "DBResult",
-    "register",
-    "write",
-    "read",
-    "writable",
-    "readable",
-]
\ No newline at end of file
+_LAZY = {
+    "PATH": "jmaps.config",
+    **{
+        name: "jmaps.journey"
+        for name in (
+            "Journey",
+            "PathOptions",
+            "get_filename",
+            "JBatch",
+            "JPath",
+            "PathResult",
+            "REF_SEP",
+            "ResetCondition",
+            "JParam",
+            "JValue",
+            "InvisibleParam",
+            "JDict",
+            "Buffer",
+            "YBuffer",
+            "XBuffer",
+            "Refer",
+            "wrap_jparam",
+            "Base",
+            "get_sql_type",
+            "cast_sql_type",
+            "get_sql_schema",
+            "canonical_json",
+            "get_schema_hash",
+            "get_env_hash",
+            "create_tables",
+            "make_engine",
+            "bulk_insert_results",
+            "DBPath",
+            "DBPathVersion",
+            "DBResult",
+            "register",
+            "register_many",
+            "write",
+            "read",
+            "writable",
+            "readable",
+        )
+    },
+}
+
+__all__ = list(_LAZY)
+# Subpackages and modules imported on first attribute access, as a plain
+# ``import jmaps`` did when it imported the Journey API eagerly.
+_SUBMODULES = {"config", "io", "journey", "paths"}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | _SUBMODULES)
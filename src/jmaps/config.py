@@ -1,30 +1,33 @@
+import os
 import pathlib
+from dataclasses import dataclass
 
 __version__ = "0.0"
 __next_major_version__ = "0.1"
 
 PathType = str | pathlib.Path
 
-home = pathlib.Path.home()
-cwd = pathlib.Path.cwd()
-module_path = pathlib.Path(__file__).parent.absolute()
+home = pathlib.Path(os.path.expanduser("~"))
+cwd = pathlib.Path(os.getcwd())
+module_path = pathlib.Path(os.path.dirname(os.path.abspath(__file__)))
 repo_path = module_path.parent
 
 
+@dataclass
 class Paths:
     """Paths is a class that contains the paths to:
-    module, repo, cwd, and cache.
-    
+    module, repo, cwd, and data.
+
     Args:
         module (pathlib.Path): The path to the module.
         repo (pathlib.Path): The path to the repo.
         cwd (pathlib.Path): The path to the current working directory.
-        journeys (pathlib.Path): The path to the journey storage directory.
+        data (pathlib.Path): The path to the journey storage directory.
     """
-    module = module_path
-    repo = repo_path
-    cwd = cwd
-    data = module / "data"
+    module: pathlib.Path = module_path
+    repo: pathlib.Path = repo_path
+    cwd: pathlib.Path = cwd
+    data: pathlib.Path = module_path / "data"
 
 
-PATH = Paths()
\ No newline at end of file
+PATH = Paths()
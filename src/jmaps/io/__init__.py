@@ -0,0 +1,6 @@
+"""Readers and writers for file-backed path results.
+
+Each module registers its IO with :mod:`jmaps.journey.io` when imported, e.g.
+``from jmaps.io import jpickle``. They are not imported here, so optional
+dependencies such as Tidy3D are only needed by the modules that use them.
+"""
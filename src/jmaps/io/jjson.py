@@ -0,0 +1,94 @@
+"""JSON IO for plain ``dict`` and ``list`` results.
+
+Small metadata results (dicts of scalars, lists of numbers) are much cheaper to
+write and read as JSON than through pickle. Only objects that round-trip
+exactly are written as JSON; anything else (NumPy arrays, tuples, non-string
+keys, dict subclasses, non-finite floats, ...) falls back to
+:func:`~jmaps.io.jpickle.pickle_writer`, and :func:`json_reader` reads either.
+
+``orjson`` is used when installed, otherwise the standard library ``json``.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any
+
+from jmaps.io.jpickle import pickle_reader, pickle_writer
+from jmaps.journey.io import atomic_write, register_many, suffixed_path
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
+
+def _is_json_exact(obj: Any) -> bool:
+    """Return ``True`` if ``obj`` survives a JSON round trip unchanged."""
+    t = type(obj)
+    if t is str or t is bool or obj is None:
+        return True
+    if t is int:
+        return -(2**63) <= obj < 2**64
+    if t is float:
+        return math.isfinite(obj)
+    if t is list:
+        return all(_is_json_exact(v) for v in obj)
+    if t is dict:
+        return all(type(k) is str and _is_json_exact(v) for k, v in obj.items())
+    return False
+
+
+def _encode(obj: Any) -> bytes | None:
+    """Return ``obj`` encoded as JSON, or ``None`` if JSON would be lossy."""
+    if not _is_json_exact(obj):
+        return None
+    try:
+        return _dumps(obj)
+    except (TypeError, ValueError):
+        # Strings that are not valid UTF-8 (e.g. lone surrogates) are rejected
+        # by orjson; ``orjson.JSONEncodeError`` is a ``TypeError``.
+        return None
+
+
+def json_writer(obj: dict | list, file_path: Path) -> None:
+    """Write a plain dict or list as JSON, or with pickle if JSON would be lossy."""
+    data = _encode(obj)
+    if data is None:
+        # Drop any JSON left by an earlier write so the reader cannot prefer it.
+        try:
+            os.unlink(suffixed_path(file_path, ".json"))
+        except FileNotFoundError:
+            pass
+        pickle_writer(obj, file_path)
+        return
+    # Write to a sibling file and swap it in, so a crash mid-write cannot leave
+    # a truncated result behind.
+    target = suffixed_path(file_path, ".json")
+    with atomic_write(target) as tmp:
+        with open(tmp, "wb") as f:
+            f.write(data)
+
+
+def json_reader(root_cls: str, file_path: Path) -> Any:
+    """Read a result written by :func:`json_writer`."""
+    try:
+        with open(suffixed_path(file_path, ".json"), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return pickle_reader(root_cls, file_path)
+    return _loads(data)
+
+
+register_many(
+    [(dict, json_writer, json_reader), (list, json_writer, json_reader)],
+    suffixes=(".json", ".pkl"),
+)
@@ -1,16 +1,224 @@
+"""Pickle-based fallback IO for arbitrary Python objects.
+
+Objects are written with pickle protocol 5. Contiguous buffers exposed through
+:class:`pickle.PickleBuffer` (e.g. NumPy arrays) are written out-of-band after
+the pickle stream instead of being copied into it, and are read straight back
+into a single buffer (or, optionally, memory-mapped) on read.
+
+File layout::
+
+    header | buffer table | pickle stream | buffer 0 | buffer 1 | ...
+
+The header is ``(magic, version, codec, n_buffers, pickle_len, payload_off)``;
+the buffer table holds one ``(offset, nbytes)`` pair per out-of-band buffer.
+Every buffer starts on a :data:`_ALIGN` byte boundary. With a codec other than
+``"raw"`` the pickle stream and each buffer are compressed independently, which
+trades read speed for a smaller file.
+"""
+
+import io
+import mmap
+import os
 import pickle
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
-from jmaps.journey.io import readable, writable
+from typing import Any, Callable, Iterator
+
+from jmaps.journey.io import atomic_write, readable, suffixed_path, writable
+
+# Protocol 5 is the first with out-of-band buffers; fixed so files do not
+# depend on the writing interpreter's HIGHEST_PROTOCOL.
+_PROTOCOL = 5
+_Pickler = pickle.Pickler
+_MAGIC = b"JMAPSPKL"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHIQQ")
+_ENTRY = struct.Struct("<QQ")
+_ALIGN = 64
+_IOV_MAX = 1024
+# Per-thread pickle output buffer, reused across writes up to this size.
+_LOCAL = threading.local()
+_MAX_REUSED = 8 << 20
+
+# name -> (header id, compress, decompress)
+_CODECS: dict[str, tuple[int, Callable[[Any], bytes], Callable[[Any], bytes]]] = {
+    "raw": (0, bytes, bytes),
+    "zlib": (1, lambda b: zlib.compress(b, 1), zlib.decompress),
+}
+try:
+    import lz4.frame
+
+    _CODECS["lz4"] = (2, lz4.frame.compress, lz4.frame.decompress)
+except ImportError:
+    pass
+try:
+    import zstandard
+
+    _CODECS["zstd"] = (
+        3,
+        zstandard.ZstdCompressor(level=1).compress,
+        zstandard.ZstdDecompressor().decompress,
+    )
+except ImportError:
+    pass
+_CODEC_IDS = {codec_id: name for name, (codec_id, _, _) in _CODECS.items()}
+
+
+def _padding(offset: int) -> int:
+    """Return the number of bytes needed to align ``offset`` to :data:`_ALIGN`."""
+    return -offset % _ALIGN
+
+
+@contextmanager
+def _dump(obj: Any, buffer_callback: Callable) -> Iterator[memoryview]:
+    """Pickle ``obj`` into this thread's reusable output buffer.
+
+    Yields a view of the pickle stream. Unlike :func:`pickle.dumps` this does
+    not copy the finished stream into a new ``bytes`` object. On exit the
+    buffer is emptied and kept for the next call, unless the stream was larger
+    than :data:`_MAX_REUSED` bytes, in which case it is dropped.
+    """
+    # Take the buffer out of the thread-local while it is in use, so a nested
+    # call (e.g. from a custom ``__reduce__``) gets a fresh one.
+    out = getattr(_LOCAL, "out", None) or io.BytesIO()
+    _LOCAL.out = None
+    _Pickler(out, protocol=_PROTOCOL, buffer_callback=buffer_callback).dump(obj)
+    size = out.tell()
+    view = out.getbuffer()[:size]
+    try:
+        yield view
+    finally:
+        view.release()
+        if size <= _MAX_REUSED:
+            try:
+                out.seek(0)
+                out.truncate()
+                _LOCAL.out = out
+            except BufferError:
+                # A view of the stream is still alive (e.g. held by a
+                # traceback); leave the buffer to it.
+                pass
+
+
+def _write_all(fd: int, chunks: list) -> None:
+    """Write ``chunks`` to the file descriptor ``fd`` in as few syscalls as possible.
+
+    The chunks go straight to the OS-level file descriptor, gathered with
+    :func:`os.writev` where available, rather than through a buffered file
+    object that would split them into many small writes. ``fd`` is closed.
+    """
+    try:
+        views = [memoryview(chunk).cast("B") for chunk in chunks if len(chunk)]
+        while views:
+            if hasattr(os, "writev"):
+                written = os.writev(fd, views[:_IOV_MAX])
+            else:
+                written = os.write(fd, views[0])
+            # Drop fully written chunks and trim a partially written one.
+            while written and views:
+                if written >= views[0].nbytes:
+                    written -= views[0].nbytes
+                    views.pop(0)
+                else:
+                    views[0] = views[0][written:]
+                    written = 0
+    finally:
+        os.close(fd)
+
+
+@writable(object, suffixes=(".pkl",))
+def pickle_writer(obj: Any, file_path: Path, codec: str = "raw") -> None:
+    """Write any Python object using pickle, with out-of-band buffers.
+
+    Args:
+        obj: Object to serialize.
+        file_path: Target path; the ``.pkl`` suffix is applied.
+        codec: Compression codec, one of ``"raw"``, ``"zlib"`` and, when the
+            packages are installed, ``"lz4"`` or ``"zstd"``. To change the
+            default for every object, re-register the writer, e.g.
+            ``register(object, writer=partial(pickle_writer, codec="zstd"),
+            reader=pickle_reader, suffixes=(".pkl",))``.
+    """
+    try:
+        codec_id, compress, _ = _CODECS[codec]
+    except KeyError:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {sorted(_CODECS)}")
+    buffers: list[pickle.PickleBuffer] = []
+    target = suffixed_path(file_path, ".pkl")
+    with _dump(obj, buffers.append) as data:
+        raws = [buf.raw() for buf in buffers]
+        if codec_id:
+            data = memoryview(compress(data))
+            raws = [memoryview(compress(raw)) for raw in raws]
+
+        pickle_off = _HEADER.size + _ENTRY.size * len(raws)
+        offset = pickle_off + data.nbytes
+        table = bytearray()
+        chunks: list[Any] = [data]
+        for raw in raws:
+            pad = _padding(offset)
+            if pad:
+                chunks.append(bytes(pad))
+            offset += pad
+            table += _ENTRY.pack(offset, raw.nbytes)
+            chunks.append(raw)
+            offset += raw.nbytes
+        payload_off = pickle_off + data.nbytes
+        header = _HEADER.pack(_MAGIC, _VERSION, codec_id, len(raws), data.nbytes, payload_off)
+
+        # Write to a sibling file and swap it in, so readers still mapping the old
+        # file keep a valid inode instead of seeing it truncated underneath them.
+        with atomic_write(target) as tmp:
+            fd = os.open(tmp, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+            _write_all(fd, [header, table] + chunks)
 
-@writable(object)
-def pickle_writer(obj: Any, file_path: Path) -> None:
-    """Write any Python object using pickle."""
-    with file_path.with_suffix(".pkl").open("wb") as f:
-        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
 
 @readable(object)
-def pickle_reader(root_cls:str, file_path: Path) -> Any:
-    """Read any Python object using pickle."""
-    with file_path.with_suffix(".pkl").open("rb") as f:
-        return pickle.load(f)
\ No newline at end of file
+def pickle_reader(root_cls: str, file_path: Path, mmap_buffers: bool = False) -> Any:
+    """Read any Python object using pickle.
+
+    Plain pickle files written by earlier versions are still readable.
+
+    Args:
+        root_cls: Qualified name of the type that was written.
+        file_path: Source path; the ``.pkl`` suffix is applied.
+        mmap_buffers: If ``False``, the file is read into memory with a single
+            ``readinto`` and out-of-band buffers are views of that copy. If
+            ``True``, they are served from a copy-on-write memory map instead,
+            so very large arrays are only paged in when accessed; every such
+            array keeps the file open while it lives, and the file cannot be
+            replaced on Windows. Enable it by re-registering the reader, e.g.
+            ``register(object, writer=pickle_writer,
+            reader=partial(pickle_reader, mmap_buffers=True), suffixes=(".pkl",))``.
+    """
+    with open(suffixed_path(file_path, ".pkl"), "rb") as f:
+        magic = f.read(len(_MAGIC))
+        f.seek(0)
+        if magic != _MAGIC:
+            return pickle.load(f)
+        if mmap_buffers:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+        else:
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(data)
+            view = memoryview(data)
+    _, version, codec_id, n_buffers, pickle_len, _ = _HEADER.unpack_from(view)
+    if version != _VERSION:
+        raise ValueError(f"Unsupported jmaps pickle version {version} in {file_path}")
+    try:
+        _, _, decompress = _CODECS[_CODEC_IDS[codec_id]]
+    except KeyError:
+        raise ValueError(f"Codec {codec_id} used by {file_path} is not available")
+    pickle_off = _HEADER.size + _ENTRY.size * n_buffers
+    buffers = []
+    for i in range(n_buffers):
+        offset, nbytes = _ENTRY.unpack_from(view, _HEADER.size + _ENTRY.size * i)
+        buffers.append(view[offset : offset + nbytes])
+    data = view[pickle_off : pickle_off + pickle_len]
+    if codec_id:
+        data = decompress(data)
+        buffers = [bytearray(decompress(buf)) for buf in buffers]
+    return pickle.loads(data, buffers=buffers)
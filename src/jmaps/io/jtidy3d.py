@@ -1,13 +1,30 @@
-import tidy3d as td
+from functools import lru_cache, reduce
 from pathlib import Path
-from typing import Any
-from jmaps.journey.io import readable, writable
+from typing import TYPE_CHECKING, Any
+from jmaps.journey.io import atomic_write, readable, suffixed_path, writable
 import importlib
+import os
+import posixpath
+import tempfile
 
+if TYPE_CHECKING:
+    import tidy3d as td
+
+# Registered by name so importing this module does not import tidy3d; objects
+# of this type can only exist once tidy3d has been imported anyway.
+_TIDY3D_BASE_MODEL = "tidy3d.components.base.Tidy3dBaseModel"
+
+@lru_cache(maxsize=None)
 def load_object(path: str):
+    """Resolve a dotted ``module.attr`` path to the object it names.
+
+    Results are cached, since every reader of a given class resolves the same
+    path.
+    """
     parts = path.split(".")
-    
-    # Find the longest valid module prefix
+
+    # Import the longest module prefix; already imported modules are returned
+    # straight from ``sys.modules`` by ``import_module``.
     for i in range(len(parts), 0, -1):
         module_name = ".".join(parts[:i])
         try:
@@ -18,18 +35,80 @@ def load_object(path: str):
     else:
         raise ImportError(f"Cannot import any module from {path}")
 
-    obj = module
-    for attr in parts[i:]:
-        obj = getattr(obj, attr)
+    return reduce(getattr, parts[i:], module)
+
+# Datasets smaller than this are copied verbatim when compressing.
+COMPRESS_MIN_BYTES = 1 << 20
+
+def _compress_hdf5(src: str, dst: str, level: int = 4):
+    """Copy the HDF5 file ``src`` to ``dst``, compressing large datasets.
 
-    return obj
+    Datasets of at least :data:`COMPRESS_MIN_BYTES` are rewritten chunked with
+    shuffle + gzip; everything else is copied unchanged. Compression is
+    transparent to h5py, so the result reads back exactly like ``src``.
+    """
+    import h5py
 
-@writable(td.components.base.Tidy3dBaseModel)
-def tidy3d_writer(obj: td.components.base.Tidy3dBaseModel, file_path: Path) -> None:
-    """Write any Python object using pickle."""
-    obj.to_file(str(file_path.with_suffix(".hdf5")))
+    with h5py.File(src, "r") as fin, h5py.File(dst, "w") as fout:
+        fout.attrs.update(fin.attrs)
+
+        def copy(name, obj):
+            parent = fout[posixpath.dirname(name) or "/"]
+            base = posixpath.basename(name)
+            if isinstance(obj, h5py.Group):
+                parent.create_group(base).attrs.update(obj.attrs)
+            elif obj.shape and obj.nbytes >= COMPRESS_MIN_BYTES:
+                ds = parent.create_dataset(
+                    base,
+                    data=obj[()],
+                    dtype=obj.dtype,
+                    chunks=True,
+                    shuffle=True,
+                    compression="gzip",
+                    compression_opts=level,
+                )
+                ds.attrs.update(obj.attrs)
+            else:
+                fin.copy(obj, parent, base)
+
+        fin.visititems(copy)
+
+@writable(_TIDY3D_BASE_MODEL, suffixes=(".hdf5",))
+def tidy3d_writer(
+    obj: "td.components.base.Tidy3dBaseModel", file_path: Path, codec: str = "raw"
+) -> None:
+    """Write a Tidy3D model to HDF5.
+
+    The file is written next to the target and renamed into place, so an
+    interrupted write never leaves a truncated result behind.
+
+    Args:
+        obj: Model to write.
+        file_path: Target path; the ``.hdf5`` suffix is applied.
+        codec: ``"raw"`` to keep Tidy3D's output as is, or ``"gzip"`` to
+            rewrite large datasets compressed (see :func:`_compress_hdf5`).
+            Select it by re-registering the writer, e.g.
+            ``register("tidy3d.components.base.Tidy3dBaseModel",
+            writer=partial(tidy3d_writer, codec="gzip"), reader=tidy3d_reader,
+            suffixes=(".hdf5",))``.
+    """
+    if codec not in ("raw", "gzip"):
+        raise ValueError(f"Unknown codec {codec!r}, expected 'raw' or 'gzip'")
+    target = suffixed_path(file_path, ".hdf5")
+    with atomic_write(target) as tmp:
+        if codec == "raw":
+            obj.to_file(tmp)
+            return
+        # Tidy3D's uncompressed output only lives until it has been rewritten.
+        fd, raw = tempfile.mkstemp(suffix=".hdf5", dir=os.path.dirname(target))
+        os.close(fd)
+        try:
+            obj.to_file(raw)
+            _compress_hdf5(raw, tmp)
+        finally:
+            os.unlink(raw)
 
-@readable(td.components.base.Tidy3dBaseModel)
+@readable(_TIDY3D_BASE_MODEL)
 def tidy3d_reader(root_cls:str, file_path: Path) -> Any:
-    """Read any Python object using pickle."""
-    return load_module(root_cls).from_file(str(file_path.with_suffix(".hdf5")))
\ No newline at end of file
+    """Read a Tidy3D model of type ``root_cls`` from HDF5."""
+    return load_object(root_cls).from_file(suffixed_path(file_path, ".hdf5"))
\ No newline at end of file
@@ -43,13 +43,19 @@ from .jmalc import (
     get_sql_type,
     cast_sql_type,
     get_sql_schema,
+    canonical_json,
+    get_schema_hash,
+    get_env_hash,
     create_tables,
+    make_engine,
+    bulk_insert_results,
     DBPath,
     DBPathVersion,
     DBResult,
 )
 from .io import (
     register,
+    register_many,
     write,
     read,
     writable,
@@ -79,11 +85,17 @@ __all__ = [
     "get_sql_type",
     "cast_sql_type",
     "get_sql_schema",
+    "canonical_json",
+    "get_schema_hash",
+    "get_env_hash",
     "create_tables",
+    "make_engine",
+    "bulk_insert_results",
     "DBPath",
     "DBPathVersion",
     "DBResult",
     "register",
+    "register_many",
     "write",
     "read",
     "writable",
@@ -5,33 +5,186 @@ capable of writing/reading instances of those types to/from disk. It is used
 by :class:`~jmaps.journey.path.PathResult` to persist file-based results.
 """
 
+import os
+import secrets
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Iterator
+from weakref import WeakKeyDictionary
+
+_WRITERS: dict[str, Callable[[Any, Path], None]] = {}
+_READERS: dict[str, Callable[[Path], Any]] = {}
+# Suffixes of the files each writer may create, see result_files.
+_SUFFIXES: dict[str, tuple[str, ...]] = {}
+# Registry generation, bumped whenever a writer is registered. Resolved entries
+# carry the generation they were computed in and are ignored once stale.
+_gen = 0
+# ``type(obj) -> (gen, writer_fn, writer_name, root_name)``. Weak keys let
+# dynamically created classes be garbage collected once unused.
+_RESOLVED_WRITERS: "WeakKeyDictionary[type, tuple]" = WeakKeyDictionary()
+# Last resolved ``(root_cls, gen, writer_fn, writer_name, root_name)``, so loops
+# over instances of a single type skip the dictionary entirely. Replaced as a
+# whole, so threads reading it never see a mix of two entries.
+_LAST: tuple = (None, -1, None, None, None)
+
+
+def _type_name(cls: type | str) -> str:
+    """Return the fully qualified name under which ``cls`` is registered.
+
+    Strings are taken to already be qualified names, which lets modules
+    register IO for a type without importing the package that defines it.
+    """
+    if isinstance(cls, str):
+        return cls
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _resolve_writer(
+    root_cls: type,
+) -> tuple[Callable[[Any, Path], None], str, str]:
+    """Find the writer for ``root_cls`` by walking its MRO.
+
+    Returns:
+        tuple: The writer function, the name of the type it was registered on,
+        and the name of ``root_cls``.
+
+    Raises:
+        TypeError: If no writer is registered for ``root_cls`` or its parents.
+    """
+    for typ in root_cls.__mro__:
+        fn = _WRITERS.get(_type_name(typ))
+        if fn is not None:
+            return fn, _type_name(typ), _type_name(root_cls)
+    raise TypeError(
+        f"No writer registered for {root_cls!r} or its parent classes {root_cls.__mro__}"
+    )
+
 
-_WRITERS: dict[type, Callable[[Any, Path], None]] = {}
-_READERS: dict[type, Callable[[Path], Any]] = {}
-_RESOLVED_WRITERS: dict[type, Callable[[Any, Path], None]] = {}
+def _invalidate_writers() -> None:
+    """Mark all memoized writer resolutions as stale."""
+    global _gen
+    _gen += 1
+
+
+def suffixed_path(file_path: Path | str, suffix: str) -> str:
+    """Return ``file_path`` with its suffix replaced by ``suffix``, as a string.
+
+    Equivalent to ``str(Path(file_path).with_suffix(suffix))``, but without
+    building intermediate :class:`~pathlib.Path` objects. Writers and readers
+    use it to derive their on-disk file names.
+    """
+    head, name = os.path.split(os.fspath(file_path))
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        name = name[:i]
+    return os.path.join(head, name + suffix)
+
+
+@contextmanager
+def atomic_write(target: str) -> Iterator[str]:
+    """Yield a new temporary path next to ``target``, moved onto it on success.
+
+    Writers write the whole result to the yielded path, so an interrupted write
+    never leaves a truncated ``target`` behind and readers of the old file keep
+    a valid inode. The temporary file has the same suffix as ``target`` and is
+    created with mode ``0o666`` minus the umask, like ``open(target, "wb")``.
+    It is removed if the block raises.
+    """
+    directory, name = os.path.split(target)
+    suffix = os.path.splitext(name)[1]
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp = os.path.join(directory, f"tmp{secrets.token_hex(8)}{suffix}")
+        try:
+            os.close(os.open(tmp, flags, 0o666))
+            break
+        except FileExistsError:
+            continue
+    try:
+        yield tmp
+        os.replace(tmp, target)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
 
 
 def register(
-    cls: type,
+    cls: type | str,
     *,
     writer: Callable[[Any, Path], None],
     reader: Callable[[Path], Any],
+    suffixes: Iterable[str] | None = None,
 ) -> None:
     """Register reader and writer functions for a type.
 
     Args:
-        cls: Type whose instances can be written and read.
+        cls: Type whose instances can be written and read, or its qualified
+            name (``"package.module.Class"``).
         writer: Callable that serializes ``cls`` instances to ``file_path``.
         reader: Callable that deserializes an instance of ``cls`` from ``file_path``.
+        suffixes: Suffixes the writer applies to ``file_path`` with
+            :func:`suffixed_path`, if known. See :func:`result_files`.
+    """
+    _WRITERS[_type_name(cls)] = writer
+    _READERS[_type_name(cls)] = reader
+    _set_suffixes(_type_name(cls), suffixes)
+    _invalidate_writers()
+
+
+def register_many(
+    entries: Iterable[
+        tuple[type, Callable[[Any, Path], None], Callable[[Path], Any]]
+    ],
+    suffixes: Iterable[str] | None = None,
+) -> None:
+    """Register reader and writer functions for several types at once.
+
+    The registry is updated in bulk and resolved writers are invalidated once,
+    rather than once per type as with repeated :func:`register` calls.
+
+    Args:
+        entries: Iterable of ``(cls, writer, reader)`` triples, as accepted by
+            :func:`register`.
+        suffixes: Suffixes applied by all of the writers, as accepted by
+            :func:`register`.
     """
-    _WRITERS[cls] = writer
-    _RESOLVED_WRITERS[cls] = writer
-    _READERS[cls] = reader
+    entries = [(_type_name(cls), writer, reader) for cls, writer, reader in entries]
+    _WRITERS.update((name, writer) for name, writer, _ in entries)
+    _READERS.update((name, reader) for name, _, reader in entries)
+    for name, _, _ in entries:
+        _set_suffixes(name, suffixes)
+    _invalidate_writers()
+
+
+def _set_suffixes(name: str, suffixes: Iterable[str] | None) -> None:
+    """Record the suffixes of the writer registered under ``name``."""
+    if suffixes is None:
+        _SUFFIXES.pop(name, None)
+    else:
+        _SUFFIXES[name] = tuple(suffixes)
+
+
+def result_files(writer_cls: str, file_path: Path) -> list[str] | None:
+    """Return the names of the files the writer for ``writer_cls`` may create.
 
+    Not every name has to exist; a writer may choose between its suffixes.
 
-def write(obj: Any, file_path: Path) -> str:
+    Args:
+        writer_cls: Type the writer was registered on, as returned by :func:`write`.
+        file_path: Path the writer was given.
+
+    Returns:
+        list[str] | None: The file names, or ``None`` if the writer was
+        registered without its suffixes.
+    """
+    suffixes = _SUFFIXES.get(writer_cls)
+    if suffixes is None:
+        return None
+    return [suffixed_path(file_path, suffix) for suffix in suffixes]
+
+
+def write(obj: Any, file_path: Path) -> list[str]:
     """Write an object to disk using the best registered writer.
 
     Resolution walks the method-resolution-order (MRO) of ``type(obj)`` so that
@@ -42,30 +195,27 @@ def write(obj: Any, file_path: Path) -> str:
         file_path: Path to the target file.
 
     Returns:
-        type: The type on which the writer was originally registered.
+        list[str]: Qualified names of the type on which the writer was
+        registered and of ``type(obj)``.
 
     Raises:
         TypeError: If no writer is registered for the object's type or its parents.
     """
+    global _LAST
     root_cls = type(obj)
-    writer_cls = type(obj)
-    try:
-        writer_cls = _RESOLVED_WRITERS[f"{root_cls.__module__}.{root_cls.__qualname__}"]
-        fn = _WRITERS[f"{writer_cls.__module__}.{writer_cls.__qualname__}"]
-    except KeyError:
-        for typ in root_cls.__mro__:
-            if f"{typ.__module__}.{typ.__qualname__}" in _WRITERS:
-                fn = _WRITERS[f"{typ.__module__}.{typ.__qualname__}"]
-                _RESOLVED_WRITERS[f"{root_cls.__module__}.{root_cls.__qualname__}"] = typ
-                writer_cls = typ
-                break
-        else:
-            raise TypeError(
-                f"No writer registered for {root_cls!r} or its parent classes {root_cls.__mro__}"
-            )
+    last = _LAST
+    if root_cls is last[0] and last[1] == _gen:
+        _, _, fn, writer_name, root_name = last
+    else:
+        entry = _RESOLVED_WRITERS.get(root_cls)
+        if entry is None or entry[0] != _gen:
+            entry = (_gen, *_resolve_writer(root_cls))
+            _RESOLVED_WRITERS[root_cls] = entry
+        _, fn, writer_name, root_name = entry
+        _LAST = (root_cls, *entry)
 
-    module_path = fn(obj, file_path)
-    return [f"{writer_cls.__module__}.{writer_cls.__qualname__}", f"{root_cls.__module__}.{root_cls.__qualname__}"]
+    fn(obj, file_path)
+    return [writer_name, root_name]
 
 
 def read(writer_cls: str, root_cls: str, file_path: Path) -> Any:
@@ -89,40 +239,45 @@ def read(writer_cls: str, root_cls: str, file_path: Path) -> Any:
     return fn(root_cls, file_path)
 
 
-def writable(cls: type):
+def writable(cls: type | str, suffixes: Iterable[str] | None = None):
     """Decorator registering a function as the writer for ``cls``.
 
     The decorated function must accept ``(obj, file_path)``.
 
     Args:
-        cls: Type whose instances will be written by the decorated function.
+        cls: Type whose instances will be written by the decorated function,
+            or its qualified name (``"package.module.Class"``).
+        suffixes: Suffixes the writer applies, as accepted by :func:`register`.
 
     Returns:
         Callable: Decorator that registers the given writer function.
     """
 
     def decorator(writer_fn: Callable[[Any, Path], None]):
-        _WRITERS[f"{cls.__module__}.{cls.__qualname__}"] = writer_fn
+        _WRITERS[_type_name(cls)] = writer_fn
+        _set_suffixes(_type_name(cls), suffixes)
+        _invalidate_writers()
         return writer_fn
 
     return decorator
 
 
-def readable(cls: type):
+def readable(cls: type | str):
     """Decorator registering a function as the reader for ``cls``.
 
     The decorated function must accept ``(file_path)`` and return an instance
     of ``cls``.
 
     Args:
-        cls: Type whose instances will be reconstructed by the decorated function.
+        cls: Type whose instances will be reconstructed by the decorated
+            function, or its qualified name (``"package.module.Class"``).
 
     Returns:
         Callable: Decorator that registers the given reader function.
     """
 
     def decorator(reader_fn: Callable[[Path], Any]):
-        _READERS[f"{cls.__module__}.{cls.__qualname__}"] = reader_fn
+        _READERS[_type_name(cls)] = reader_fn
         return reader_fn
 
     return decorator
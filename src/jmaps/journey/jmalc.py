@@ -5,22 +5,87 @@ results, as well as small utilities to map Python values to SQL-friendly
 types and schemas.
 """
 
+import hashlib
+import io
+import json
+import warnings
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy import (
     TIMESTAMP,
     Column,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
     Integer,
     String,
+    bindparam,
+    create_engine,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+    update,
 )
+from sqlalchemy.engine import make_url
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-
+from sqlalchemy.orm import DeclarativeBase, relationship
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class Base(DeclarativeBase):
+    """Declarative base shared by all Journey cache tables."""
+
+# SQL type name per Python type. Seeded with the builtins and extended with
+# every other type (e.g. NumPy scalars) the first time it is classified.
+_SQL_TYPES: dict[type, str] = {
+    bool: "bool",
+    float: "float",
+    int: "int",
+    str: "str",
+    datetime: "datetime",
+}
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp(value: datetime) -> float:
+    """Return the POSIX timestamp of ``value``, skipping tzinfo calls for UTC."""
+    if value.tzinfo is timezone.utc:
+        return (value - _EPOCH_UTC).total_seconds()
+    return value.timestamp()
+
+
+_SQL_CASTS = {
+    "bool": lambda value: value,
+    "float": float,
+    "int": int,
+    "str": lambda value: value,
+    "datetime": _timestamp,
+}
+
+
+def _classify_sql_type(value_type: type):
+    """Return the SQL type name for ``value_type``, or ``None`` if unsupported."""
+    # Plain subclass checks first; np.issubdtype builds a dtype for its
+    # argument, so it is only consulted for everything else.
+    if issubclass(value_type, bool):
+        return "bool"
+    if issubclass(value_type, str):
+        return "str"
+    if issubclass(value_type, datetime):
+        return "datetime"
+    if np.issubdtype(value_type, np.floating):
+        return "float"
+    if np.issubdtype(value_type, np.integer):
+        return "int"
+    return None
 
-Base = declarative_base()
 
 def get_sql_type(value):
     """Return the canonical SQL type name for a Python value.
@@ -34,20 +99,17 @@ def get_sql_type(value):
     Raises:
         TypeError: If the value cannot be represented as a supported SQL type.
     """
-    if isinstance(value, bool):
-        return "bool"
-    if np.issubdtype(type(value), np.floating):
-        return "float"
-    if np.issubdtype(type(value), np.integer):
-        return "int"
-    if isinstance(value, str):
-        return "str"
-    if isinstance(value, datetime):
-        return "datetime"
-    raise TypeError(
-        f"Value: {value}, with type {type(value)} is not a valid type for sql "
-        "(int, float, bool, str, datetime)."
-    )
+    value_type = type(value)
+    sql_type = _SQL_TYPES.get(value_type)
+    if sql_type is None:
+        sql_type = _classify_sql_type(value_type)
+        if sql_type is None:
+            raise TypeError(
+                f"Value: {value}, with type {value_type} is not a valid type for sql "
+                "(int, float, bool, str, datetime)."
+            )
+        _SQL_TYPES[value_type] = sql_type
+    return sql_type
 
 def cast_sql_type(value):
     """Cast a Python value to a JSON-/SQL-serializable primitive.
@@ -69,37 +131,145 @@ def cast_sql_type(value):
     Raises:
         TypeError: If the value cannot be represented as a supported SQL type.
     """
-    if isinstance(value, bool):
-        return value
-    if np.issubdtype(type(value), np.floating):
-        return float(value)
-    if np.issubdtype(type(value), np.integer):
-        return int(value)
-    if isinstance(value, str):
-        return value
-    if isinstance(value, datetime):
-        return value.timestamp()
-    raise TypeError(
-        f"Value: {value}, with type {type(value)} is not a valid type for sql "
-        "(int, float, bool, str, datetime)."
-    )
+    return _SQL_CASTS[get_sql_type(value)](value)
+
+# Schemas of recently seen environment shapes, keyed on the ordered parameter
+# names and value types. Cleared when it grows past _SCHEMA_CACHE_SIZE.
+_SCHEMA_CACHE: dict[tuple, dict[str, str]] = {}
+_SCHEMA_CACHE_SIZE = 1024
+
 
 def get_sql_schema(sql_data):
     """Infer a flat schema for a mapping of SQL-storable values.
 
+    Environments of the same path usually share their names and value types,
+    so schemas are memoized on that shape and returned as a fresh copy.
+
     Args:
         sql_data (dict[str, object]): Mapping from parameter name to value.
 
     Returns:
         dict[str, str]: Mapping from parameter name to inferred SQL type name.
     """
-    schema: dict[str, str] = {}
-    for k, v in sql_data.items():
-        schema[k] = get_sql_type(v)
-    return schema
+    shape = (tuple(sql_data), tuple(map(type, sql_data.values())))
+    schema = _SCHEMA_CACHE.get(shape)
+    if schema is None:
+        schema = dict(zip(sql_data, map(get_sql_type, sql_data.values())))
+        if len(_SCHEMA_CACHE) >= _SCHEMA_CACHE_SIZE:
+            _SCHEMA_CACHE.clear()
+        _SCHEMA_CACHE[shape] = schema
+    return dict(schema)
+
+
+def canonical_json(value) -> bytes:
+    """Serialize ``value`` to compact JSON bytes with sorted keys.
+
+    The same value always gives the same bytes, which makes them suitable
+    for hashing. The hashes are stored in the database, so this always uses
+    the standard library ``json`` module: ``orjson`` formats floats such as
+    ``1e-07`` and NaN differently and would change them depending on what is
+    installed.
+
+    Args:
+        value: JSON-serializable value.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
 
 
-def create_tables(engine):
+def get_schema_hash(env_schema, file_schema) -> str:
+    """Return a short hash identifying a pair of path version schemas.
+
+    Stored in :attr:`DBPathVersion.schema_hash` so versions can be found
+    through an index instead of comparing JSON documents.
+
+    Args:
+        env_schema (dict[str, str]): Environment schema of the version.
+        file_schema (dict | None): File schema of the version, if any.
+
+    Returns:
+        str: Hex-encoded 128-bit BLAKE2b digest of the canonical JSON.
+    """
+    dumped = canonical_json([env_schema, file_schema])
+    return hashlib.blake2b(dumped, digest_size=16).hexdigest()
+
+
+def get_env_hash(env_sql: dict | bytes) -> str:
+    """Return a short hash identifying the SQL data of an environment.
+
+    Stored in :attr:`DBResult.env_hash` so cached results can be found
+    through an index instead of comparing JSON documents.
+
+    Args:
+        env_sql (dict[str, Any] | bytes): Flattened SQL data of the
+            environment, or its :func:`canonical_json` if already serialized.
+
+    Returns:
+        str: Hex-encoded 128-bit BLAKE2b digest of the canonical JSON.
+    """
+    dumped = env_sql if isinstance(env_sql, bytes) else canonical_json(env_sql)
+    return hashlib.blake2b(dumped, digest_size=16).hexdigest()
+
+
+def _orjson_serializer(value) -> str:
+    """Encode a JSON column value with ``orjson``, returning ``str`` for DBAPIs."""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+# Rows per multi-row INSERT statement when inserting many rows at once.
+INSERT_PAGE_SIZE = 10_000
+# Number of buffered timestamped results that triggers a flush to the database,
+# also the number of rows migrated at a time.
+RESULT_BATCH_SIZE = 1000
+# Connection pool defaults for server databases (ignored for SQLite).
+POOL_OPTIONS = {
+    "pool_size": 20,
+    "max_overflow": 40,
+    "pool_use_lifo": True,
+    "pool_pre_ping": False,
+    "pool_recycle": 1800,
+}
+
+
+def make_engine(url: str, **kwargs):
+    """Create a SQLAlchemy engine configured for the Journey cache.
+
+    The ``environment``/``data`` and schema columns are JSON, which SQLAlchemy
+    encodes and decodes with the standard library ``json`` module by default.
+    When ``orjson`` is installed it is used instead. Bulk inserts are batched
+    into multi-row ``INSERT`` statements of up to :data:`INSERT_PAGE_SIZE`
+    rows, and with psycopg2 other executemany statements (e.g. bulk
+    ``UPDATE``) use its ``execute_batch`` helper. Server databases get a
+    connection pool configured by :data:`POOL_OPTIONS`, which reuses the most
+    recently returned connection first and skips the per-checkout ping. Any
+    keyword argument is passed to :func:`sqlalchemy.create_engine` and
+    overrides these defaults; pass ``poolclass=NullPool`` to disable pooling.
+
+    Args:
+        url: Database URL, e.g. ``"postgresql+psycopg2://user@host/db"``.
+        **kwargs: Extra arguments for :func:`sqlalchemy.create_engine`.
+
+    Returns:
+        Engine: The configured engine.
+    """
+    if orjson is not None:
+        kwargs.setdefault("json_serializer", _orjson_serializer)
+        kwargs.setdefault("json_deserializer", orjson.loads)
+    kwargs.setdefault("insertmanyvalues_page_size", INSERT_PAGE_SIZE)
+    url = make_url(url)
+    if url.get_driver_name() == "psycopg2":
+        kwargs.setdefault("executemany_mode", "values_plus_batch")
+    if url.get_backend_name() != "sqlite" and "poolclass" not in kwargs:
+        for key, value in POOL_OPTIONS.items():
+            kwargs.setdefault(key, value)
+    return create_engine(url, **kwargs)
+
+
+def create_tables(engine, dedupe_results: bool = False):
     """Create all Journey cache tables on the given engine.
 
     This is safe to call repeatedly; tables are only created if they do not
@@ -107,8 +277,108 @@ def create_tables(engine):
 
     Args:
         engine: SQLAlchemy :class:`Engine` bound to the target database.
+        dedupe_results: Databases written by earlier versions may hold several
+            untimestamped results for the same environment. If ``True``, all
+            but the newest of them are deleted; otherwise such duplicates raise
+            an error and the database is left unchanged.
+
+    Raises:
+        RuntimeError: If duplicate untimestamped results exist and
+            ``dedupe_results`` is ``False``.
     """
     Base.metadata.create_all(engine)
+    _migrate_tables(engine, dedupe_results)
+
+
+def _migrate_tables(engine, dedupe_results: bool):
+    """Bring tables created by an earlier version up to the current models.
+
+    ``create_all`` only creates missing tables, so columns added since are
+    added here (all of them are nullable), followed by any missing index.
+    Until the unique index on untimestamped results exists, missing result
+    hashes are filled in and duplicate untimestamped results are checked for,
+    see :func:`create_tables`.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        preparer = conn.dialect.identifier_preparer
+        for column in _ADDED_COLUMNS:
+            table = column.table
+            if column.name in {c["name"] for c in inspector.get_columns(table.name)}:
+                continue
+            conn.execute(
+                text(
+                    f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN "
+                    f"{preparer.format_column(column)} "
+                    f"{column.type.compile(dialect=conn.dialect)}"
+                )
+            )
+        result_indexes = {index["name"] for index in inspector.get_indexes("result")}
+        if "uq_result_pathver_env_hash" not in result_indexes:
+            _backfill_env_hashes(conn)
+            _dedupe_untimestamped_results(conn, dedupe_results)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def _dedupe_untimestamped_results(conn, delete_duplicates: bool):
+    """Keep only the newest untimestamped result per path version and hash.
+
+    Raises:
+        RuntimeError: If there are duplicates and ``delete_duplicates`` is
+            ``False``.
+    """
+    table = DBResult.__table__
+    untimestamped = (table.c.created_at.is_(None), table.c.env_hash.is_not(None))
+    newest = (
+        select(func.max(table.c.id))
+        .where(*untimestamped)
+        .group_by(table.c.path_name, table.c.path_version_num, table.c.env_hash)
+    )
+    duplicate = (*untimestamped, table.c.id.not_in(newest))
+    count = conn.execute(select(func.count()).where(*duplicate)).scalar_one()
+    if not count:
+        return
+    if not delete_duplicates:
+        raise RuntimeError(
+            f"The result table holds {count} untimestamped results that duplicate "
+            "a newer result for the same environment. Call "
+            "jmaps.journey.create_tables(engine, dedupe_results=True) once to "
+            "delete them and finish migrating the database."
+        )
+    conn.execute(delete(table).where(*duplicate))
+    warnings.warn(
+        f"Deleted {count} untimestamped results that duplicated a newer result "
+        "for the same environment.",
+        # Point at the caller of create_tables.
+        stacklevel=4,
+    )
+
+
+def _backfill_env_hashes(conn):
+    """Set :attr:`DBResult.env_hash` on every result row from its environment.
+
+    Rows are streamed and updated :data:`RESULT_BATCH_SIZE` at a time, so the
+    result table is never held in memory at once.
+    """
+    table = DBResult.__table__
+    set_hash = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(env_hash=bindparam("hash"))
+    )
+    rows = conn.execution_options(yield_per=RESULT_BATCH_SIZE).execute(
+        select(table.c.id, table.c.environment).where(table.c.env_hash.is_(None))
+    )
+    for partition in rows.partitions():
+        conn.execute(
+            set_hash,
+            [
+                {"row_id": row_id, "hash": get_env_hash(environment)}
+                for row_id, environment in partition
+            ],
+        )
 
 
 class DBPath(Base):
@@ -143,6 +413,10 @@ class DBPathVersion(Base):
     results = relationship("DBResult", back_populates="path_version")
     env_schema = Column(JSONB, nullable=False)
     file_schema = Column(JSONB, nullable=True)
+    # get_schema_hash(env_schema, file_schema); NULL for rows written before
+    # the column existed.
+    schema_hash = Column(String(32), nullable=True)
+    __table_args__ = (Index("ix_path_version_name_schema_hash", "name", "schema_hash"),)
 
 
 class DBResult(Base):
@@ -155,6 +429,9 @@ class DBResult(Base):
     data = Column(JSONB, nullable=True)
     file_path = Column(String, nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    # get_env_hash(environment); NULL for rows written before the column
+    # existed, which are matched on the environment itself.
+    env_hash = Column(String(32), nullable=True)
 
     # Relationship back to PathVersion
     path_version = relationship("DBPathVersion", back_populates="results")
@@ -167,5 +444,98 @@ class DBResult(Base):
             ["path_name", "path_version_num"],
             ["path_version.name", "path_version.version"],
         ),
+        # PostgreSQL does not index foreign keys; results are always looked up
+        # per path version, most recent first.
+        Index(
+            "ix_result_pathver_created",
+            "path_name",
+            "path_version_num",
+            text("created_at DESC"),
+        ),
+        # Cache hits are looked up by environment hash. There is at most one
+        # untimestamped result per environment, which saves upsert against.
+        Index(
+            "uq_result_pathver_env_hash",
+            "path_name",
+            "path_version_num",
+            "env_hash",
+            unique=True,
+            postgresql_where=text("created_at IS NULL"),
+            sqlite_where=text("created_at IS NULL"),
+        ),
     )
 
+
+# Columns added to existing tables since their first release, in the order
+# they were added. See _migrate_tables.
+_ADDED_COLUMNS = (
+    DBPathVersion.__table__.c.schema_hash,
+    DBResult.__table__.c.env_hash,
+)
+
+
+# Batches smaller than this are inserted with a plain multi-row INSERT; COPY
+# only pays off once its fixed setup cost is amortized.
+COPY_MIN_ROWS = 100
+_COPY_COLUMNS = (
+    "environment",
+    "data",
+    "file_path",
+    "created_at",
+    "path_name",
+    "path_version_num",
+    "env_hash",
+)
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_field(column: str, value) -> str:
+    """Format one value for PostgreSQL's ``COPY`` text format."""
+    if value is None:
+        return "\\N"
+    if column in ("environment", "data"):
+        if orjson is not None:
+            value = _orjson_serializer(value)
+        else:
+            value = json.dumps(value)
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return value.translate(_COPY_ESCAPES)
+
+
+def bulk_insert_results(session, rows: list[dict]) -> None:
+    """Insert many :class:`DBResult` rows in one round trip.
+
+    On PostgreSQL with psycopg2, batches of at least :data:`COPY_MIN_ROWS`
+    rows are streamed with ``COPY ... FROM STDIN``. Smaller batches and other
+    backends use a single executemany ``INSERT``. The rows are written within
+    the session's transaction; committing is left to the caller.
+
+    Args:
+        session: SQLAlchemy session to insert through.
+        rows (list[dict]): One mapping per result, keyed by :class:`DBResult`
+            column name. Missing optional columns are stored as ``NULL``.
+    """
+    if not rows:
+        return
+    connection = session.connection()
+    dialect = connection.dialect
+    if (
+        len(rows) < COPY_MIN_ROWS
+        or dialect.name != "postgresql"
+        or dialect.driver != "psycopg2"
+    ):
+        session.execute(insert(DBResult), rows)
+        return
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(_copy_field(c, row.get(c)) for c in _COPY_COLUMNS))
+        buf.write("\n")
+    buf.seek(0)
+    with connection.connection.dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {DBResult.__tablename__} ({', '.join(_COPY_COLUMNS)}) FROM STDIN",
+            buf,
+        )
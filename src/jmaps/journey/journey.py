@@ -5,30 +5,47 @@ graphs, running (possibly batched) subpaths, caching results in a SQL
 database, and loading previously computed results when possible.
 """
 
+from collections import Counter, OrderedDict, namedtuple
 from typing import Union, Any, Dict
 from pathlib import Path
 from datetime import datetime, timezone
-import copy
 import hashlib
-import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from tqdm import tqdm
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy import select, Null
+from sqlalchemy import and_, bindparam, func, insert, select, update, Null
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.engine import Engine
 
 from jmaps.config import PATH
 from jmaps.journey.jmalc import (
+    RESULT_BATCH_SIZE,
+    bulk_insert_results,
+    canonical_json,
     cast_sql_type,
+    get_schema_hash,
+    get_env_hash,
     get_sql_schema,
     create_tables,
     DBPath,
     DBPathVersion,
     DBResult,
 )
-from jmaps.journey.path import JPath, JBatch, PathResult
+from jmaps.journey.io import result_files
+from jmaps.journey.path import JPath, PathResult
 from jmaps.journey.param import REF_SEP, JDict
+
+# Default number of results kept in memory across runs, see Journey.result_cache_size.
+# Off by default; results are then only kept for the duration of a run.
+RESULT_CACHE_SIZE = 0
+# Dialect-specific INSERT constructs supporting ON CONFLICT.
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
 class PathOptions(BaseModel):
     """Runtime options controlling path execution and caching."""
 
@@ -57,21 +74,207 @@ class PathOptions(BaseModel):
         validate_assignment = True
 
 
-def get_filename(hashable: dict) -> str:
+# Immutable copy of PathOptions passed down a run; _replace is a tuple copy,
+# unlike model_copy, which builds and validates a new model.
+_RunOptions = namedtuple("_RunOptions", PathOptions.model_fields)
+
+
+def get_filename(hashable: dict | bytes) -> str:
     """Compute a deterministic key from a JSON-serializable mapping.
 
-    The key is currently a SHA256 hash of the canonical JSON representation and
-    is used to derive cache file names for path results.
+    The key is a hash of the canonical JSON representation and is used to
+    derive cache file names for path results. It is a 128-bit BLAKE2b digest
+    whichever optional packages are installed, so machines sharing a database
+    and its result files agree on the names.
 
     Args:
-        hashable: JSON-serializable mapping (typically environment SQL data).
+        hashable: JSON-serializable mapping (typically environment SQL data),
+            or its :func:`canonical_json` if already serialized.
 
     Returns:
-        str: Hex-encoded SHA256 digest.
+        str: Hex-encoded digest.
+    """
+    dumped = hashable if isinstance(hashable, bytes) else canonical_json(hashable)
+    return hashlib.blake2b(dumped, digest_size=16).hexdigest()
+
+
+def _stat_file(path: str) -> tuple[int, int] | None:
+    """Return the modification time and size of ``path``, or ``None`` if it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _stat_result_files(
+    file_path: Path | None, file_schema: dict | None
+) -> tuple[tuple[str, tuple[int, int] | None], ...]:
+    """Return each file a result may have been written to, with its :func:`_stat_file`.
+
+    The names come from the suffixes their writers were registered with, so
+    only those files are looked at. Files of writers registered without
+    suffixes are found by the ``<name>_<key>`` prefix :meth:`PathResult.to_file`
+    gives them, which lists the directory.
     """
-    dumped = json.dumps(hashable, sort_keys=True, separators=(",", ":"))
-    key = hashlib.sha256(dumped.encode("utf-8")).hexdigest()
-    return key
+    if file_path is None or not file_schema:
+        return ()
+    names = []
+    for key, (writer_name, _) in file_schema.items():
+        key_path = file_path.with_name(file_path.name + "_" + key)
+        files = result_files(writer_name, key_path)
+        if files is None:
+            files = sorted(map(str, file_path.parent.glob(key_path.name + "*")))
+        names.extend(files)
+    return tuple((name, _stat_file(name)) for name in names)
+
+
+def _result_files_unchanged(stats: tuple[tuple[str, tuple[int, int] | None], ...]) -> bool:
+    """Return ``True`` if every file in ``stats`` still has the same mtime and size."""
+    return all(_stat_file(name) == stat for name, stat in stats)
+
+
+# Statements are built once and executed with bound parameters.
+_CURRENT_VERSIONS_STMT = (
+    select(
+        DBPath.name,
+        DBPathVersion.version,
+        DBPathVersion.env_schema,
+        DBPathVersion.file_schema,
+    )
+    .join(
+        DBPathVersion,
+        and_(
+            DBPathVersion.name == DBPath.name,
+            DBPathVersion.version == DBPath.current_version,
+        ),
+    )
+    .where(DBPath.name.in_(bindparam("names", expanding=True)))
+)
+_VERSION_BY_HASH_STMT = select(DBPathVersion).where(
+    DBPathVersion.name == bindparam("path_name"),
+    DBPathVersion.schema_hash == bindparam("schema_hash"),
+)
+_MAX_VERSION_STMT = select(func.max(DBPathVersion.version)).where(
+    DBPathVersion.name == bindparam("path_name")
+)
+_SET_CURRENT_VERSION_STMT = (
+    update(DBPath)
+    .where(DBPath.name == bindparam("path_name"))
+    .values(current_version=bindparam("version"))
+)
+_RESULT_STMT = select(DBResult).where(
+    DBResult.path_name == bindparam("path_name"),
+    DBResult.path_version_num == bindparam("version"),
+    DBResult.env_hash == bindparam("env_hash"),
+    DBResult.created_at == Null(),
+)
+_LEGACY_RESULT_STMT = select(DBResult).where(
+    DBResult.path_name == bindparam("path_name"),
+    DBResult.path_version_num == bindparam("version"),
+    DBResult.env_hash == Null(),
+    DBResult.environment == bindparam("environment"),
+    DBResult.created_at == Null(),
+)
+
+
+def _current_versions(session, path_names: list[str]):
+    """Return ``(name, version, env_schema, file_schema)`` rows of current path versions."""
+    return session.execute(_CURRENT_VERSIONS_STMT, {"names": path_names}).all()
+
+
+def _result_upsert(insert_fn):
+    """Build an INSERT of untimestamped :class:`DBResult` rows that replaces the
+    data and file path of an existing result of the same environment."""
+    stmt = insert_fn(DBResult)
+    return stmt.on_conflict_do_update(
+        index_elements=[DBResult.path_name, DBResult.path_version_num, DBResult.env_hash],
+        index_where=DBResult.created_at == Null(),
+        set_={"data": stmt.excluded.data, "file_path": stmt.excluded.file_path},
+    )
+
+
+_RESULT_UPSERTS = {
+    name: _result_upsert(insert_fn) for name, insert_fn in _UPSERT_INSERTS.items()
+}
+
+
+def _upsert_results(session, path_name: str, rows: list[dict]):
+    """Save untimestamped :class:`DBResult` rows of one path.
+
+    Existing results of the same path version and environment are updated.
+    PostgreSQL and SQLite do this in one upsert statement; other backends
+    look up the existing rows first, including rows saved before
+    :attr:`DBResult.env_hash` existed.
+
+    Args:
+        session: Active SQLAlchemy session.
+        path_name: Name of the path.
+        rows: Rows keyed by column name, at most one per version and environment.
+    """
+    result_upsert = _RESULT_UPSERTS.get(session.get_bind().dialect.name)
+    if result_upsert is not None:
+        session.execute(result_upsert, rows)
+        return
+    pending = {(row["path_version_num"], row["env_hash"]): row for row in rows}
+    versions = {version for version, _ in pending}
+    existing = session.execute(
+        select(DBResult).where(
+            DBResult.path_name == path_name,
+            DBResult.path_version_num.in_(versions),
+            DBResult.env_hash.in_([env_hash for _, env_hash in pending]),
+            DBResult.created_at == Null(),
+        )
+    ).scalars().all()
+    if len(existing) < len(pending):
+        # Rows saved before env_hash existed are matched on the environment.
+        existing += session.execute(
+            select(DBResult).where(
+                DBResult.path_name == path_name,
+                DBResult.path_version_num.in_(versions),
+                DBResult.env_hash == Null(),
+                DBResult.environment.in_([row["environment"] for row in rows]),
+                DBResult.created_at == Null(),
+            )
+        ).scalars().all()
+    for db_result in existing:
+        env_hash = db_result.env_hash or get_env_hash(db_result.environment)
+        row = pending.pop((db_result.path_version_num, env_hash), None)
+        if row is not None:
+            db_result.env_hash = env_hash
+            db_result.data = row.get("data")
+            db_result.file_path = row["file_path"]
+    if pending:
+        session.execute(insert(DBResult), list(pending.values()))
+
+
+def _find_result(session, path_name: str, version: int, env_sql: dict, env_hash: str):
+    """Return the untimestamped :class:`DBResult` of an environment, or ``None``.
+
+    Rows saved before :attr:`DBResult.env_hash` existed are matched on the
+    environment itself, and their hash is filled in.
+    """
+    params = {"path_name": path_name, "version": version}
+    db_result = session.execute(
+        _RESULT_STMT, {**params, "env_hash": env_hash}
+    ).scalar_one_or_none()
+    if db_result is None:
+        db_result = session.execute(
+            _LEGACY_RESULT_STMT, {**params, "environment": env_sql}
+        ).scalar_one_or_none()
+        if db_result is not None:
+            db_result.env_hash = env_hash
+    return db_result
+
+
+def _resolve_sql_value(env: JDict, keys: tuple[str, ...]) -> Any:
+    """Return the SQL value of the parameter found by walking ``keys`` into ``env``."""
+    jparam = env
+    for key in keys[:-1]:
+        jparam = jparam[key]
+    dtype = jparam.data[keys[-1]].dtype
+    value = jparam[keys[-1]]
+    return cast_sql_type(value) if dtype is None else dtype(value)
 
 
 class Journey(BaseModel):
@@ -90,6 +293,19 @@ class Journey(BaseModel):
     env: JDict = Field(default_factory=JDict)
     paths: Dict[str, JPath] = Field(default_factory=dict)
     cache_db_meta: bool = Field(True, description ='If true, does not query the database for the latest current_path_version, instead storing and retrieving it from the cache.')
+    result_cache_size: int = Field(
+        RESULT_CACHE_SIZE,
+        description=(
+            "Number of loaded or saved results kept in memory across runs, so "
+            "results shared between runs are not read again. Cached results "
+            "are shared and should be treated as read-only, and are checked "
+            "against the modification time and size of their result files "
+            "before reuse; results without files are only kept for the run "
+            "that loaded or saved them. If 0 (the default), only results of paths that "
+            "several paths of a run depend on are kept, for the duration of "
+            "the run."
+        ),
+    )
     db_current_path_versions: Dict[str, int] = Field(default_factory=dict)
     db_current_path_env_schemas: Dict[str, dict] = Field(default_factory=dict)
     db_current_path_file_schemas: Dict[str, dict] = Field(default_factory=dict)
@@ -101,6 +317,32 @@ class Journey(BaseModel):
     Session: Any = Field(
         ..., description="Factory for creating SQLAlchemy sessions to the cache DB."
     )
+    _cycles: dict[str, list[str]] | None = PrivateAttr(
+        default=None
+    )  # Result of _detect_cycles, cleared whenever paths are updated
+    _pending_results: list[dict] = PrivateAttr(
+        default_factory=list
+    )  # Timestamped DBResult rows not yet written, see flush_cache
+    _db_lock: threading.RLock = PrivateAttr(
+        default_factory=threading.RLock
+    )  # Serializes cache loads and saves of concurrently running subpaths
+    _result_cache: OrderedDict[
+        tuple[str, int, str], tuple[PathResult, tuple | None]
+    ] = PrivateAttr(
+        default_factory=OrderedDict
+    )  # Recently loaded or saved results in LRU order, see _cache_result
+    _env_schema_keys: dict[str, tuple[dict, list]] = PrivateAttr(
+        default_factory=dict
+    )  # Per path, an env schema and its parameter names split on REF_SEP
+    _deferred_results: dict[str, dict[tuple[str, ...], dict[str, PathResult]]] = (
+        PrivateAttr(default_factory=dict)
+    )  # Per path, computed results not saved yet by parameter names and env hash
+    _shared_paths: set[str] = PrivateAttr(
+        default_factory=set
+    )  # Paths several paths of the running tree depend on, see _cache_result
+    _ensured_dirs: set[Path] = PrivateAttr(
+        default_factory=set
+    )  # Path result directories created or found by this journey, see update_path
 
     def __init__(
         self,
@@ -109,7 +351,8 @@ class Journey(BaseModel):
         env: JDict | None = None,
         paths: Union[dict[str, JPath], list[JPath]] | None = None,
         result_directory: Path | None = None,
-        cache_db_meta: bool= True
+        cache_db_meta: bool= True,
+        result_cache_size: int = RESULT_CACHE_SIZE,
     ):
         """Initialize a :class:`Journey`.
 
@@ -122,6 +365,8 @@ class Journey(BaseModel):
                 each path is keyed by ``path.name``.
             result_directory: Base directory where file-backed results are stored.
                 Defaults to ``PATH.journeys / name``.
+            result_cache_size: Number of results kept in memory across runs;
+                0 keeps them only for the duration of a run.
         """
         if paths is None:
             paths = {}
@@ -137,9 +382,15 @@ class Journey(BaseModel):
         session_factory = sessionmaker(bind=engine)
         Session = scoped_session(session_factory)
 
-        for path_name, path in paths.items():
+        # One directory listing instead of a mkdir call per path.
+        with os.scandir(result_directory) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+        ensured_dirs = set()
+        for path_name in paths:
             path_dir = result_directory / path_name
-            path_dir.mkdir(parents=True, exist_ok=True)
+            if path_name not in existing:
+                path_dir.mkdir(parents=True, exist_ok=True)
+            ensured_dirs.add(path_dir)
 
         super().__init__(
             name=name,
@@ -149,8 +400,10 @@ class Journey(BaseModel):
             env=env if env is not None else JDict(data={}),
             paths=paths,
             result_directory=result_directory,
-            cache_db_meta=cache_db_meta
+            cache_db_meta=cache_db_meta,
+            result_cache_size=result_cache_size,
         )
+        self._ensured_dirs = ensured_dirs
 
     def update_path(self, path: JPath, validate: bool = True):
         """Updates a single path int the journey.
@@ -163,10 +416,13 @@ class Journey(BaseModel):
             validate: If ``True``, run :meth:`validate_paths` after adding.
         """
         self.paths[path.name] = path
+        self._cycles = None
         if validate:
             self.validate_paths(error=True)
         path_dir = self.result_directory / path.name
-        path_dir.mkdir(parents=True, exist_ok=True)
+        if path_dir not in self._ensured_dirs:
+            path_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path_dir)
 
     def update_paths(self, new_paths: list[JPath], validate: bool = True):
         """Update multiple paths in the journey.
@@ -176,7 +432,7 @@ class Journey(BaseModel):
             validate: If ``True``, run :meth:`validate_paths` after adding.
         """
         for path in new_paths:
-            self.add_path(path, validate=False)
+            self.update_path(path, validate=False)
         if validate:
             self.validate_paths(error=True)
 
@@ -188,32 +444,71 @@ class Journey(BaseModel):
         """Return the mapping of all registered paths."""
         return self.paths
 
-    def circular_subpaths(
-        self, path_name: str, paths_prior: list[str] | None = None
-    ) -> list[str]:
+    def _detect_cycles(self) -> dict[str, list[str]]:
+        """Find a circular subpath dependency reachable from every path.
+
+        Runs a single iterative depth-first search over the whole path graph,
+        so each path and subpath edge is visited once. Paths whose subtree is
+        known, acyclic or not, are not explored again from later roots.
+
+        Returns:
+            dict[str, list[str]]: Mapping from path name to the sequence of path
+            names leading from it into a cycle, or an empty list if none.
+        """
+        cycles: dict[str, list[str]] = {}
+        for root in self.paths:
+            if root in cycles:
+                continue
+            # Current DFS branch, with each node's position and pending subpaths.
+            stack = [root]
+            position = {root: 0}
+            pending = [iter(self.paths[root].subpaths)]
+            while stack:
+                for subpath_name in pending[-1]:
+                    if subpath_name not in self.paths:
+                        continue
+                    if subpath_name in position:
+                        # Back edge: the branch from here closes a cycle.
+                        start = position[subpath_name]
+                        for i, name in enumerate(stack):
+                            cycles[name] = stack[i:] + stack[start : max(i, start) + 1]
+                        stack.clear()
+                        break
+                    known = cycles.get(subpath_name)
+                    if known is None:
+                        position[subpath_name] = len(stack)
+                        stack.append(subpath_name)
+                        pending.append(iter(self.paths[subpath_name].subpaths))
+                        break
+                    if known:
+                        for i, name in enumerate(stack):
+                            cycles[name] = stack[i:] + known
+                        stack.clear()
+                        break
+                else:
+                    # All subpaths are acyclic.
+                    name = stack.pop()
+                    pending.pop()
+                    del position[name]
+                    cycles[name] = []
+        return cycles
+
+    def circular_subpaths(self, path_name: str) -> list[str]:
         """Detect circular subpath dependencies rooted at ``path_name``.
 
+        Cycles are detected for all paths at once and reused until the paths of
+        the journey are updated.
+
         Args:
             path_name: Name of the path to check.
-            paths_prior: Accumulated list of path names visited so far.
 
         Returns:
             list[str]: Empty list if no circular dependency is found; otherwise
             the sequence of path names forming the cycle.
         """
-        if paths_prior is None:
-            paths_prior = []
-        if path_name in paths_prior:
-            return paths_prior + [path_name]
-        paths_prior.append(path_name)
-        for subpath_name in self.paths[path_name].subpaths:
-            if subpath_name in self.paths:
-                circular_path = self.circular_subpaths(
-                    subpath_name, copy.copy(paths_prior)
-                )
-                if len(circular_path) > 0:
-                    return circular_path
-        return []
+        if self._cycles is None or path_name not in self._cycles:
+            self._cycles = self._detect_cycles()
+        return self._cycles[path_name]
 
     def validate_path(
         self, path_name: str, error: bool = True, verbose: bool = True
@@ -236,17 +531,15 @@ class Journey(BaseModel):
             * circular_path: Sequence of path names forming a detected cycle,
               or an empty list if no cycle is found.
         """
-        path = self.paths[path_name]
-        missing_subpaths: list[str] = []
-        missing_batched_subpaths: list[str] = []
-
-        for subpath_name in path.subpaths:
-            if subpath_name not in self.paths:
-                missing_subpaths.append(subpath_name)
+        paths = self.paths
+        path = paths[path_name]
+        # Comprehensions rather than set differences keep the declared order
+        # (and any duplicates) for the error messages.
+        missing_subpaths = [name for name in path.subpaths if name not in paths]
+        missing_batched_subpaths = [
+            name for name in path.batched_subpaths if name not in paths
+        ]
         circular_path = self.circular_subpaths(path_name)
-        for subpath_name in path.batched_subpaths:
-            if subpath_name not in self.paths:
-                missing_batched_subpaths.append(subpath_name)
         if (len(missing_subpaths) > 0 or len(missing_batched_subpaths) > 0) and (
             error or verbose
         ):
@@ -276,34 +569,32 @@ class Journey(BaseModel):
             error: If ``True``, raise an error when any invalid paths are found;
                 otherwise print a summary string.
         """
-        error_string = "Invalid paths"
-        invalid = False
-        for path_name, path in self.paths.items():
+        errors = ["Invalid paths"]
+        # Paths may have been edited in place, so always start from scratch.
+        self._cycles = self._detect_cycles()
+        for path_name in self.paths:
             (
                 missing_subpaths,
                 missing_batched_subpaths,
                 circular_path,
             ) = self.validate_path(path_name, error=False, verbose=False)
             # If any envs or subpaths are missing, add to invalid paths string.
-            if len(missing_subpaths) > 0:
-                error_string += (
-                    f"\n{path_name} is missing subpath(s): "
-                    f"{', '.join(missing_subpaths)}"
+            if missing_subpaths:
+                errors.append(
+                    f"{path_name} is missing subpath(s): {', '.join(missing_subpaths)}"
                 )
-                invalid = True
-            if len(missing_batched_subpaths) > 0:
-                error_string += (
-                    f"\n{path_name} is missing batched subpath(s): "
+            if missing_batched_subpaths:
+                errors.append(
+                    f"{path_name} is missing batched subpath(s): "
                     f"{', '.join(missing_batched_subpaths)}"
                 )
-                invalid = True
-            if len(circular_path) > 0:
-                error_string += (
-                    f"\n{path_name} is circular with: {', '.join(circular_path)}"
+            if circular_path:
+                errors.append(
+                    f"{path_name} is circular with: {', '.join(circular_path)}"
                 )
-                invalid = True
         # If any paths are invalid, raise an error/warning.
-        if invalid:
+        if len(errors) > 1:
+            error_string = "\n".join(errors)
             if error:
                 raise ValueError(error_string)
             else:
@@ -322,11 +613,97 @@ class Journey(BaseModel):
         """
         if path_name not in self.paths:
             raise ValueError(f"The path '{path_name}' does not exist in this Journey")
-        local_env = self.env.model_copy(deep=True)
-        return self._run(local_env, path_name, path_options, is_parent=True)
+        if self.paths[path_name].copy_env:
+            local_env = self.env.model_copy(deep=True)
+        else:
+            local_env = self.env
+        closure = self._subpath_closure(path_name)
+        if self.cache_db_meta and not path_options.disable_saving_and_loading:
+            self.prefetch_metadata(closure)
+        # Several paths of the tree depend on these, so their results are
+        # worth keeping for the run even without a result cache.
+        parents = Counter(
+            subpath_name
+            for name in closure
+            for subpath_name in set(self.paths[name].subpaths)
+            if subpath_name in self.paths
+        )
+        self._shared_paths = {name for name, count in parents.items() if count > 1}
+        # Loads and saves of the whole path tree share the thread's scoped
+        # session, which is closed once the run is over.
+        try:
+            return self._run(local_env, path_name, path_options, is_parent=True)
+        finally:
+            if not self.result_cache_size:
+                self._result_cache.clear()
+            else:
+                # Results without files cannot be checked for changes, so
+                # they are not reused by later runs.
+                for key, (_, stats) in list(self._result_cache.items()):
+                    if not stats:
+                        del self._result_cache[key]
+            self._deferred_results.clear()
+            try:
+                self.flush_cache()
+            finally:
+                self.Session.remove()
+
+    def _subpath_closure(self, path_name: str) -> list[str]:
+        """Return ``path_name`` and every path it transitively depends on."""
+        seen = {path_name}
+        stack = [path_name]
+        while stack:
+            for subpath_name in self.paths[stack.pop()].subpaths:
+                if subpath_name in self.paths and subpath_name not in seen:
+                    seen.add(subpath_name)
+                    stack.append(subpath_name)
+        return list(seen)
+
+    def prefetch_metadata(self, path_names: list[str]):
+        """Cache the current version and schemas of several paths in one query.
+
+        Fills :attr:`db_current_path_versions`,
+        :attr:`db_current_path_env_schemas` and
+        :attr:`db_current_path_file_schemas` for every path that has been saved
+        before, so :meth:`load_path_results` does not query them one by one.
+        Paths already cached are skipped.
+
+        Args:
+            path_names: Names of the paths to prefetch.
+        """
+        names = [n for n in path_names if n not in self.db_current_path_env_schemas]
+        if not names:
+            return
+        for name, version, env_schema, file_schema in _current_versions(
+            self.Session(), names
+        ):
+            self.db_current_path_versions[name] = version
+            self.db_current_path_env_schemas[name] = env_schema
+            self.db_current_path_file_schemas[name] = file_schema
+
+    def flush_cache(self):
+        """Write buffered timestamped results to the cache database.
+
+        Results of paths with ``save_datetime`` are never loaded back, so
+        :meth:`save_path_results` buffers them and inserts them in batches of
+        :data:`RESULT_BATCH_SIZE`. :meth:`run` flushes when it returns; call
+        this directly when driving :meth:`_run` yourself.
+        """
+        with self._db_lock:
+            if not self._pending_results:
+                return
+            session = self.Session()
+            bulk_insert_results(session, self._pending_results)
+            session.commit()
+            self._pending_results.clear()
 
     def _run(
-        self, local_env: JDict, path_name: str, path_options: PathOptions, is_parent: bool = False
+        self,
+        local_env: JDict,
+        path_name: str,
+        path_options: PathOptions,
+        is_parent: bool = False,
+        deferred: list[tuple[dict, PathResult]] | None = None,
     ):
         """Core implementation for running a path and its subpaths.
 
@@ -338,16 +715,22 @@ class Journey(BaseModel):
             path_name: Name of the path to run.
             path_options: Execution and caching options.
             is_parent: ``True`` if this invocation is the top-level call.
+            deferred: If given, a computed result is appended to it as
+                ``(env_sql, result)`` instead of being saved, so the caller
+                can save many of them with :meth:`save_path_results_bulk`.
 
         Returns:
             tuple[PathResult, dict[str, Any] | None]: Path result and subpath results.
         """
+        if isinstance(path_options, PathOptions):
+            path_options = _RunOptions(**dict(path_options))
         local_env.init_run(is_parent)
         local_env.reset_usage()
 
         result: PathResult | None = None
         if path_options.force_run_to_depth == 0 and not path_options.disable_saving_and_loading:
-            result = self.load_path_results(local_env, path_name)
+            with self._db_lock:
+                result = self.load_path_results(local_env, path_name)
         if result is not None:
             if path_options.verbose:
                 print(f"Loading {path_name}: {result}")
@@ -357,11 +740,8 @@ class Journey(BaseModel):
         else:
             if path_options.verbose:
                 print(f"Running {path_name}.")
-        subpath_options = path_options.model_copy()
-        subpath_options.force_run_to_depth = (
-            subpath_options.force_run_to_depth - 1
-            if subpath_options.force_run_to_depth > 0
-            else 0
+        subpath_options = path_options._replace(
+            force_run_to_depth=max(path_options.force_run_to_depth - 1, 0)
         )
         subpath_results = self.run_subpaths(local_env, path_name, subpath_options)
         if result is None:
@@ -370,8 +750,17 @@ class Journey(BaseModel):
                 local_env, subpath_results, path_options.verbose
             )
             # Save the results to cache.
-            if not path_options.disable_saving_and_loading:
-                self.save_path_results(local_env, path_name, result)
+            if path_options.disable_saving_and_loading:
+                pass
+            elif deferred is not None:
+                # Usage is reset by the caller, so capture the environment now.
+                env_sql = local_env.get_sql_data(show_unused=False, show_invisible=False)
+                deferred.append((env_sql, result))
+                with self._db_lock:
+                    self._defer_result(path_name, env_sql, result)
+            else:
+                with self._db_lock:
+                    self.save_path_results(local_env, path_name, result)
         # Plot the path results.
         if path_options.plot:
             self.paths[path_name].plot(result, subpath_results)
@@ -391,10 +780,25 @@ class Journey(BaseModel):
             dict[str, PathResult | dict[str, PathResult]]: Mapping from subpath
             name to result or nested batch results.
         """
+        path = self.paths[path_name]
         subpath_results: dict[str, PathResult | dict[str, PathResult]] = {}
+        if path.subpath_workers > 1:
+            plain_subpaths = [
+                name for name in path.subpaths if name not in path.batched_subpaths
+            ]
+            if len(plain_subpaths) > 1 and not self._plots(
+                plain_subpaths, subpath_options
+            ):
+                subpath_results.update(
+                    self._run_concurrently(
+                        local_env, plain_subpaths, subpath_options, path.subpath_workers
+                    )
+                )
         # Run the subpaths, and retrieve the files their results are stored in.
-        for subpath_name in self.paths[path_name].subpaths:
-            batch = self.paths[path_name].get_batch(
+        for subpath_name in path.subpaths:
+            if subpath_name in subpath_results:
+                continue
+            batch = path.get_batch(
                 subpath_name, local_env, subpath_results
             )
             if batch is None:
@@ -416,26 +820,218 @@ class Journey(BaseModel):
                 else:
                     enumerate_batch = batch.items()
                 update_local_env = True
-                for batch_id, batch_env in enumerate_batch:
-                    subpath_env = local_env.model_copy(deep=True)
-                    batch_env.init_run(is_parent_path=True, parent_env=subpath_env)
-                    subpath_env.replace(batch_env)
-                    subpath_result, _ = self._run(
-                        subpath_env, subpath_name, subpath_options, is_parent=False
-                    )
-                    # Update parameter usage according to subpath usage.
-                    if update_local_env:
-                        # These are dependent parameters, so don't count towards usage.
-                        batch_env.reset_usage()
-                        local_env.merge_usage(subpath_env)
-
-                    # Save the results of the subpath.
-                    subpath_results[subpath_name][batch_id] = subpath_result
+                # Computed batch results are saved together, RESULT_BATCH_SIZE at a time;
+                # until then, elements with the same environment load them from memory.
+                deferred: list[tuple[dict, PathResult]] = []
+                try:
+                    if (
+                        path.batch_workers > 1
+                        and len(batch) > 1
+                        and not self._plots([subpath_name], subpath_options)
+                    ):
+                        subpath_results[subpath_name] = self._run_batch_concurrently(
+                            local_env,
+                            subpath_name,
+                            enumerate_batch,
+                            subpath_options,
+                            path.batch_workers,
+                            deferred,
+                        )
+                    else:
+                        for batch_id, batch_env in enumerate_batch:
+                            # Entries overridden by the batch are replaced right away.
+                            subpath_env = local_env.deep_copy_except(batch_env.data)
+                            batch_env.init_run(is_parent_path=True, parent_env=subpath_env)
+                            subpath_env.replace(batch_env)
+                            subpath_result, _ = self._run(
+                                subpath_env,
+                                subpath_name,
+                                subpath_options,
+                                is_parent=False,
+                                deferred=deferred,
+                            )
+                            # Update parameter usage according to subpath usage.
+                            if update_local_env:
+                                # These are dependent parameters, so don't count towards usage.
+                                batch_env.reset_usage()
+                                local_env.merge_usage(subpath_env)
+
+                            # Save the results of the subpath.
+                            subpath_results[subpath_name][batch_id] = subpath_result
+                            if len(deferred) >= RESULT_BATCH_SIZE:
+                                self._save_deferred(subpath_name, deferred)
+                finally:
+                    # Results computed before a failure are still worth keeping.
+                    self._save_deferred(subpath_name, deferred)
         return subpath_results
 
+    def _plots(self, path_names: list[str], path_options: PathOptions) -> bool:
+        """Return whether running ``path_names`` would call a custom :meth:`JPath.plot`.
+
+        Plotting is not thread safe, so such runs stay sequential. The base
+        :meth:`JPath.plot` does nothing and does not count.
+        """
+        if not path_options.plot:
+            return False
+        return any(
+            type(self.paths[name]).plot is not JPath.plot
+            for path_name in path_names
+            for name in self._subpath_closure(path_name)
+        )
+
+    def _save_deferred(self, path_name: str, deferred: list[tuple[dict, PathResult]]):
+        """Save and clear results collected by :meth:`_run` with ``deferred``."""
+        if deferred:
+            with self._db_lock:
+                self.save_path_results_bulk(path_name, deferred)
+                pending = self._deferred_results.get(path_name, {})
+                for env_sql, _ in deferred:
+                    pending.get(tuple(env_sql), {}).pop(get_env_hash(env_sql), None)
+            deferred.clear()
+
+    def _defer_result(self, path_name: str, env_sql: dict, result: PathResult):
+        """Make a result that is not saved yet loadable by later runs with the same environment.
+
+        Batch elements with identical environments then load the result of
+        the first one, as they would once it is saved.
+        """
+        if not self.paths[path_name].save_datetime:
+            by_names = self._deferred_results.setdefault(path_name, {})
+            by_names.setdefault(tuple(env_sql), {})[get_env_hash(env_sql)] = result
+
+    def _load_deferred(self, local_env: JDict, path_name: str) -> PathResult | None:
+        """Return a result passed to :meth:`_defer_result` for the same environment, if any."""
+        for names, results in self._deferred_results.get(path_name, {}).items():
+            if not results:
+                continue
+            temp_env = {
+                name: _resolve_sql_value(local_env, tuple(name.split(REF_SEP)))
+                for name in names
+            }
+            result = results.get(get_env_hash(temp_env))
+            if result is not None:
+                return result
+            local_env.reset_usage()
+        return None
+
+    def _run_batch_concurrently(
+        self,
+        local_env: JDict,
+        subpath_name: str,
+        enumerate_batch,
+        subpath_options: PathOptions,
+        max_workers: int,
+        deferred: list[tuple[dict, PathResult]],
+    ) -> dict[str, PathResult]:
+        """Run the elements of a batch in a thread pool.
+
+        Elements are prepared, and their usage merged into ``local_env``, on
+        the calling thread. At most twice ``max_workers`` elements are in
+        flight at once. Computed results are appended to ``deferred``, which is
+        saved every :data:`RESULT_BATCH_SIZE` results.
+
+        Args:
+            local_env: Environment of the parent path.
+            subpath_name: Name of the batched subpath.
+            enumerate_batch: Iterable of ``(batch_id, batch_env)`` pairs.
+            subpath_options: Execution options propagated to subpaths.
+            max_workers: Maximum number of threads.
+            deferred: Results not yet saved, see :meth:`_run`.
+
+        Returns:
+            dict[str, PathResult]: Result of each batch element, in batch order.
+        """
+
+        def run_one(subpath_env: JDict):
+            own: list[tuple[dict, PathResult]] = []
+            try:
+                subpath_result, _ = self._run(
+                    subpath_env, subpath_name, subpath_options, is_parent=False, deferred=own
+                )
+            finally:
+                # Close this worker thread's scoped session.
+                self.Session.remove()
+            return subpath_result, own
+
+        order = []
+        results: dict[str, PathResult] = {}
+        in_flight = {}
+
+        def collect(futures):
+            for future in futures:
+                batch_id, batch_env, subpath_env = in_flight.pop(future)
+                subpath_result, own = future.result()
+                # These are dependent parameters, so don't count towards usage.
+                batch_env.reset_usage()
+                local_env.merge_usage(subpath_env)
+                results[batch_id] = subpath_result
+                deferred.extend(own)
+            if len(deferred) >= RESULT_BATCH_SIZE:
+                self._save_deferred(subpath_name, deferred)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch_id, batch_env in enumerate_batch:
+                order.append(batch_id)
+                # Entries overridden by the batch are replaced right away.
+                subpath_env = local_env.deep_copy_except(batch_env.data)
+                batch_env.init_run(is_parent_path=True, parent_env=subpath_env)
+                subpath_env.replace(batch_env)
+                future = executor.submit(run_one, subpath_env)
+                in_flight[future] = (batch_id, batch_env, subpath_env)
+                if len(in_flight) >= 2 * max_workers:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(list(in_flight))
+        return {batch_id: results[batch_id] for batch_id in order}
+
+    def _run_concurrently(
+        self,
+        local_env: JDict,
+        subpath_names: list[str],
+        subpath_options: PathOptions,
+        max_workers: int,
+    ) -> dict[str, PathResult]:
+        """Run independent, non-batched subpaths in a thread pool.
+
+        Each subpath gets its own copy of ``local_env``; their usage is merged
+        back into ``local_env`` once all of them have finished.
+
+        Args:
+            local_env: Environment of the parent path.
+            subpath_names: Names of the subpaths to run.
+            subpath_options: Execution options propagated to subpaths.
+            max_workers: Maximum number of threads.
+
+        Returns:
+            dict[str, PathResult]: Result of each subpath, in ``subpath_names`` order.
+        """
+        subpath_envs = [local_env.model_copy(deep=True) for _ in subpath_names]
+
+        def run_one(subpath_name: str, subpath_env: JDict) -> PathResult:
+            try:
+                subpath_result, _ = self._run(
+                    subpath_env, subpath_name, subpath_options, is_parent=False
+                )
+            finally:
+                # Close this worker thread's scoped session.
+                self.Session.remove()
+            return subpath_result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run_one, subpath_names, subpath_envs))
+        for subpath_env in subpath_envs:
+            local_env.merge_usage(subpath_env)
+        return dict(zip(subpath_names, results))
+
     def load_path_results(self, local_env: JDict, path_name: str):
         """Load results for a path from the cache, if available.
 
+        Results loaded, saved or computed but not saved yet earlier in the
+        run, or in earlier runs if :attr:`result_cache_size` is set and their
+        files are unchanged, are returned from memory, so subpaths shared by
+        several paths are only read once. Such results are shared and should
+        be treated as read-only.
+
         Args:
             local_env: Environment containing parameter trees.
             path_name: Name of the path whose results should be loaded.
@@ -447,108 +1043,138 @@ class Journey(BaseModel):
         if self.paths[path_name].save_datetime:
             return None
         session = self.Session()
-        path_version_num = None
-        env_schema = None
-        if self.cache_db_meta and path_name in self.db_current_path_versions:
+        if self.cache_db_meta:
+            if path_name not in self.db_current_path_env_schemas:
+                self.prefetch_metadata([path_name])
+            if path_name not in self.db_current_path_env_schemas:
+                return self._load_deferred(local_env, path_name)
             path_version_num = self.db_current_path_versions[path_name]
-        else:
-            path_stmt = select(DBPath).where(DBPath.name == path_name)
-            path = session.execute(path_stmt).scalar_one_or_none()
-            
-            if path is None:
-                return None
-            path_version_num = path.current_version
-            if self.cache_db_meta:
-                self.db_current_path_versions[path_name] = path_version_num
-
-        if self.cache_db_meta and path_name in self.db_current_path_env_schemas:
             env_schema = self.db_current_path_env_schemas[path_name]
             file_schema = self.db_current_path_file_schemas[path_name]
         else:
-            path_version_num = path.current_version
-            version_stmt = select(DBPathVersion).where(
-                DBPathVersion.name == path_name,
-                DBPathVersion.version == path_version_num,
+            rows = _current_versions(session, [path_name])
+            if not rows:
+                return self._load_deferred(local_env, path_name)
+            _, path_version_num, env_schema, file_schema = rows[0]
+        cached = self._env_schema_keys.get(path_name)
+        if cached is None or cached[0] is not env_schema:
+            cached = (
+                env_schema,
+                [(name, tuple(name.split(REF_SEP))) for name in env_schema],
             )
-            path_version = session.execute(version_stmt).scalar_one_or_none()
-            if path_version is None:
-                return None
-            env_schema = path_version.env_schema
-            file_schema = path_version.file_schema
-            if self.cache_db_meta:
-                self.db_current_path_env_schemas[path_name] = env_schema
-                self.db_current_path_file_schemas[path_name] = file_schema
-        temp_env: dict[str, Any] = {}
-        for param_used in env_schema.keys():
-            param_path = param_used.split(REF_SEP)
-            jparam = local_env
-            dtype = None
-            for i, key in enumerate(param_path):
-                if i == len(param_path) - 1:
-                    dtype = jparam.data[key].dtype
-                jparam = jparam[key]
-            temp_env[param_used] = (
-                cast_sql_type(jparam) if dtype is None else dtype(jparam)
-            )
-        result_stmt = select(DBResult).where(
-            DBResult.path_name == path_name,
-            DBResult.path_version_num == path_version_num,
-            DBResult.environment == temp_env,
-            DBResult.created_at == Null(),
-        )
-        db_result = session.execute(result_stmt).scalar_one_or_none()
+            self._env_schema_keys[path_name] = cached
+        temp_env = {name: _resolve_sql_value(local_env, keys) for name, keys in cached[1]}
+        env_hash = get_env_hash(temp_env)
+        run_key = (path_name, path_version_num, env_hash)
+        entry = self._result_cache.get(run_key)
+        if entry is not None:
+            result, stats = entry
+            if stats is None or _result_files_unchanged(stats):
+                self._result_cache.move_to_end(run_key)
+                return result
+            del self._result_cache[run_key]
+        db_result = _find_result(session, path_name, path_version_num, temp_env, env_hash)
         if db_result is None:
             local_env.reset_usage()
-            return None
+            return self._load_deferred(local_env, path_name)
+        if session.dirty:
+            # Keep the hash filled in for a legacy row.
+            session.commit()
         result = PathResult(sql=db_result.data)
-        result.from_file(
-            Path(db_result.file_path) if db_result.file_path is not None else None,
-            file_schema,
-        )
+        file_path = Path(db_result.file_path) if db_result.file_path is not None else None
+        result.from_file(file_path, file_schema)
+        self._cache_result(run_key, result, file_path, file_schema)
         return result
 
-    def save_path_results(self, local_env: JDict, path_name: str, result: PathResult):
-        """Persist the results of a path into the cache database.
+    def _cache_result(
+        self,
+        key: tuple[str, int, str],
+        result: PathResult,
+        file_path: Path | None,
+        file_schema: dict | None,
+    ):
+        """Keep ``result`` in memory, evicting the least recently used results.
+
+        Results kept across runs record the stat of their files, so they are
+        not reused once the files have been rewritten or removed. Without a
+        result cache, only results of paths that several paths of the running
+        tree depend on are kept, until the run returns.
 
         Args:
-            local_env: Environment used to generate the results.
-            path_name: Name of the path.
-            result: Results of the path run.
+            key: Path name, path version and environment hash of the result.
+            result: Loaded or saved result.
+            file_path: Base path of the result's files.
+            file_schema: Schema the result's files were written with, if any.
         """
-        session = self.Session()
-        env_sql = local_env.get_sql_data(show_unused=False, show_invisible=False)
-        env_schema = get_sql_schema(env_sql)
+        if not self.result_cache_size and key[0] not in self._shared_paths:
+            return
+        stats = (
+            _stat_result_files(file_path, file_schema) if self.result_cache_size else None
+        )
+        self._result_cache[key] = (result, stats)
+        self._result_cache.move_to_end(key)
+        if self.result_cache_size:
+            while len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
 
-        file_path = self.result_directory / path_name / get_filename(env_sql)
-        file_schema = result.to_file(file_path)
-        file_schema = file_schema if file_schema is not None else Null()
-        # Check if a DBPath already exists with this name.
-        path_stmt = select(DBPath).where(DBPath.name == path_name)
-        path = session.execute(path_stmt).scalar_one_or_none()
-        if path is None:
-            path = DBPath(
-                name=path_name,
-                current_version=None,
-                description=self.paths[path_name].changelog,
+    def _save_path_version(
+        self, session, path_name: str, env_schema: dict, file_schema: Any
+    ) -> int:
+        """Make the path version with the given schemas current, creating it if needed.
+
+        Args:
+            session: Session the changes are made in.
+            path_name: Name of the path.
+            env_schema: Schema of the environment used by the path.
+            file_schema: Schema of the file results, or SQL ``NULL``.
+
+        Returns:
+            int: The version number.
+        """
+        # Create the DBPath unless it exists, in one statement where supported.
+        values = {
+            "name": path_name,
+            "current_version": None,
+            "description": self.paths[path_name].changelog,
+        }
+        upsert_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        if upsert_insert is not None:
+            session.execute(
+                upsert_insert(DBPath)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=[DBPath.name])
             )
-            session.add(path)
-            session.commit()
-        version_stmt = select(DBPathVersion).where(
-            DBPathVersion.name == path_name,
-            DBPathVersion.env_schema == env_schema,
-            DBPathVersion.file_schema == file_schema,
+        else:
+            if session.get(DBPath, path_name) is None:
+                session.add(DBPath(**values))
+                session.flush()
+        schema_hash = get_schema_hash(
+            env_schema, None if isinstance(file_schema, Null) else file_schema
+        )
+        path_version = (
+            session.execute(
+                _VERSION_BY_HASH_STMT, {"path_name": path_name, "schema_hash": schema_hash}
+            )
+            .scalars()
+            .first()
         )
-        path_version = session.execute(version_stmt).scalar_one_or_none()
+        if path_version is None:
+            # Versions saved before schema_hash existed are compared by value.
+            legacy_stmt = select(DBPathVersion).where(
+                DBPathVersion.name == path_name,
+                DBPathVersion.schema_hash == Null(),
+                DBPathVersion.env_schema == env_schema,
+                DBPathVersion.file_schema == file_schema,
+            )
+            path_version = session.execute(legacy_stmt).scalar_one_or_none()
+            if path_version is not None:
+                path_version.schema_hash = schema_hash
 
         if path_version is None:
             # Find the latest version number for this path_name.
-            max_version_stmt = (
-                select(DBPathVersion.version)
-                .where(DBPathVersion.name == path_name)
-                .order_by(DBPathVersion.version.desc())
-                .limit(1)
-            )
-            max_version_result = session.execute(max_version_stmt).scalar_one_or_none()
+            max_version_result = session.execute(
+                _MAX_VERSION_STMT, {"path_name": path_name}
+            ).scalar()
             next_version = 0 if max_version_result is None else (max_version_result + 1)
             # Create a new DBPathVersion entry.
             path_version = DBPathVersion(
@@ -557,62 +1183,170 @@ class Journey(BaseModel):
                 version=next_version,
                 env_schema=env_schema,
                 file_schema=file_schema,
+                schema_hash=schema_hash,
             )
             session.add(path_version)
-            session.commit()
-        path_version_num = path_version.version
-        path.current_version = path_version_num
+            session.flush()
+        session.execute(
+            _SET_CURRENT_VERSION_STMT,
+            {"path_name": path_name, "version": path_version.version},
+        )
+        return path_version.version
+
+    def _resolve_path_version(
+        self, session, path_name: str, env_schema: dict, file_schema
+    ) -> int:
+        """Return the version of ``path_name`` to save results with these schemas under.
+
+        Uses the cached current version when its schemas match, otherwise
+        falls back to :meth:`_save_path_version`.
+
+        Args:
+            session: Active SQLAlchemy session.
+            path_name: Name of the path.
+            env_schema: SQL schema of the environment.
+            file_schema: File schema of the result, or ``Null()``.
+
+        Returns:
+            int: The path version number.
+        """
+        file_schema_value = None if isinstance(file_schema, Null) else file_schema
+        if (
+            self.cache_db_meta
+            and path_name in self.db_current_path_versions
+            and self.db_current_path_env_schemas.get(path_name) == env_schema
+            and self.db_current_path_file_schemas.get(path_name) == file_schema_value
+        ):
+            # The current version already has these schemas.
+            return self.db_current_path_versions[path_name]
+        path_version_num = self._save_path_version(
+            session, path_name, env_schema, file_schema
+        )
         if self.cache_db_meta:
             self.db_current_path_versions[path_name] = path_version_num
             self.db_current_path_env_schemas[path_name] = env_schema
-            self.db_current_path_file_schemas[path_name] = file_schema if not isinstance(file_schema, Null) else None
+            self.db_current_path_file_schemas[path_name] = file_schema_value
+        return path_version_num
+
+    def save_path_results(self, local_env: JDict, path_name: str, result: PathResult):
+        """Persist the results of a path into the cache database.
+
+        Args:
+            local_env: Environment used to generate the results.
+            path_name: Name of the path.
+            result: Results of the path run.
+        """
+        session = self.Session()
+        env_sql = local_env.get_sql_data(show_unused=False, show_invisible=False)
+        env_schema = get_sql_schema(env_sql)
+
+        # Both keys hash the same serialization.
+        dumped = canonical_json(env_sql)
+        env_hash = get_env_hash(dumped)
+        file_path = self.result_directory / path_name / get_filename(dumped)
+        file_schema = result.to_file(file_path)
+        file_schema = file_schema if file_schema is not None else Null()
+        path_version_num = self._resolve_path_version(
+            session, path_name, env_schema, file_schema
+        )
         # Add new DBResult entry, linking to the path_version.
+        # Columns left out of the row are stored as SQL NULL.
+        row = {
+            "environment": env_sql,
+            "path_name": path_name,
+            "path_version_num": path_version_num,
+            "env_hash": env_hash,
+        }
+        if result.sql is not None:
+            row["data"] = result.sql
         if self.paths[path_name].save_datetime:
-            db_result = DBResult(
-                environment=env_sql,
-                data=result.sql if result.sql is not None else Null(),
-                path_name=path_name,
-                path_version_num=path_version_num,
-                file_path=str(file_path) if not isinstance(file_schema, Null) else Null(),
-                created_at=datetime.now(timezone.utc),
-            )
-            session.add(db_result)
+            row["created_at"] = datetime.now(timezone.utc)
+            if not isinstance(file_schema, Null):
+                row["file_path"] = str(file_path)
+            self._pending_results.append(row)
         else:
-            result_stmt = select(DBResult).where(
-                DBResult.path_name == path_name,
-                DBResult.path_version_num == path_version_num,
-                DBResult.environment == env_sql,
-                DBResult.created_at == Null(),
+            row["file_path"] = str(file_path)
+            _upsert_results(session, path_name, [row])
+            self._cache_result(
+                (path_name, path_version_num, env_hash),
+                result,
+                file_path,
+                None if isinstance(file_schema, Null) else file_schema,
             )
-            db_result = session.execute(result_stmt).scalar_one_or_none()
-            if db_result is None:
-                db_result = DBResult(
-                    environment=env_sql,
-                    data=result.sql if result.sql is not None else Null(),
-                    path_name=path_name,
-                    path_version_num=path_version_num,
-                    file_path=str(file_path) if file_path is not None else Null(),
-                    created_at=Null(),
-                )
-                session.add(db_result)
+        session.commit()
+        if len(self._pending_results) >= RESULT_BATCH_SIZE:
+            self.flush_cache()
+
+    def save_path_results_bulk(
+        self, path_name: str, runs: list[tuple[dict, PathResult]]
+    ):
+        """Persist the results of many runs of one path at once.
+
+        Equivalent to calling :meth:`save_path_results` for each run, but the
+        results are written with a single upsert (a lookup and an insert on
+        backends without one) and committed once.
+
+        Args:
+            path_name: Name of the path.
+            runs: ``(env_sql, result)`` pairs, where ``env_sql`` is the SQL data
+                of the environment used, e.g. for the elements of a batch.
+        """
+        session = self.Session()
+        save_datetime = self.paths[path_name].save_datetime
+        rows: dict[tuple[int, str], dict] = {}
+        for env_sql, result in runs:
+            dumped = canonical_json(env_sql)
+            env_hash = get_env_hash(dumped)
+            file_path = self.result_directory / path_name / get_filename(dumped)
+            file_schema = result.to_file(file_path)
+            path_version_num = self._resolve_path_version(
+                session,
+                path_name,
+                get_sql_schema(env_sql),
+                file_schema if file_schema is not None else Null(),
+            )
+            # Columns left out of the row are stored as SQL NULL.
+            row = {
+                "environment": env_sql,
+                "path_name": path_name,
+                "path_version_num": path_version_num,
+                "env_hash": env_hash,
+            }
+            if result.sql is not None:
+                row["data"] = result.sql
+            if save_datetime:
+                row["created_at"] = datetime.now(timezone.utc)
+                if file_schema is not None:
+                    row["file_path"] = str(file_path)
+                self._pending_results.append(row)
             else:
-                db_result.data = result.sql
-                db_result.file_path = str(file_path) if file_path is not None else None
+                row["file_path"] = str(file_path)
+                # A later run with the same environment replaces an earlier one.
+                rows[(path_version_num, env_hash)] = row
+                self._cache_result(
+                    (path_name, path_version_num, env_hash), result, file_path, file_schema
+                )
+        if rows:
+            _upsert_results(session, path_name, list(rows.values()))
         session.commit()
+        if len(self._pending_results) >= RESULT_BATCH_SIZE:
+            self.flush_cache()
 
     # Overrides
     def get_str(self) -> str:
         """Return a human-readable string representation of the Journey."""
-        string = f"Journey({self.name})\n"
-        string += "Environment:\n"
-        string += str(self.env.data)
-        string += "\n"
-        string += "Paths:\n"
+        parts = [
+            f"Journey({self.name})\n",
+            "Environment:\n",
+            str(self.env.data),
+            "\n",
+            "Paths:\n",
+        ]
         for path_name, path in self.paths.items():
-            string += f"   {path_name}"
-            if len(path.subpaths) > 0:
-                string += ", Subpaths: " + ", ".join(path.subpaths)
-        return string
+            parts.append(f"   {path_name}")
+            if path.subpaths:
+                parts.append(", Subpaths: " + ", ".join(path.subpaths))
+        return "".join(parts)
 
     def __str__(self) -> str:
         """Return :meth:`get_str` for ``str(journey)``."""
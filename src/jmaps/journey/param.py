@@ -5,6 +5,7 @@ its concrete subclasses) that tracks usage, supports locking, and can produce
 SQL-friendly representations of the current environment state.
 """
 
+import copy
 from enum import Enum, auto
 from inspect import signature
 from abc import ABC, abstractmethod
@@ -214,6 +215,22 @@ class JDict(JParam):
         other.merge_dtypes(self)
         self.data.update(other.data)
 
+    def deep_copy_except(self, keys) -> "JDict":
+        """Return a deep copy whose entries under ``keys`` are shared, not copied.
+
+        Used when the copy is about to have those entries replaced (see
+        :meth:`replace`), so copying them would be wasted work. The shared
+        entries must not be mutated through the copy.
+
+        Args:
+            keys: Top-level names whose entries are shared with ``self``.
+        """
+        memo: dict[int, Any] = {}
+        data = {
+            k: v if k in keys else copy.deepcopy(v, memo) for k, v in self.data.items()
+        }
+        return self.model_copy(update={"data": data})
+
     def __getitem__(self, key: str):
         return self.data[key].get_value()
 
@@ -235,6 +252,11 @@ class JDict(JParam):
             self.data[key] = wrap_jparam(value)
 
     def __getattr__(self, key: str):
+        # Parameter names are the common case; resolve them before falling
+        # back to pydantic's private-attribute lookup, which raises on a miss.
+        data = self.__dict__.get("data")
+        if data is not None and key in data and not key.startswith("_"):
+            return data[key].get_value()
         try:
             return super().__getattr__(key)
         except AttributeError:
@@ -275,16 +297,41 @@ class JDict(JParam):
         self, show_unused: bool = False, show_invisible: bool = False, return_schema: bool = False
     ):
         """Return a flattened SQL-friendly representation of the parameter tree."""
-        sql_dict: dict[str, Any] = {}
+        return dict(self.iter_sql_data(show_unused, show_invisible, return_schema))
+
+    def iter_sql_data(
+        self,
+        show_unused: bool = False,
+        show_invisible: bool = False,
+        return_schema: bool = False,
+        prefix: str = "",
+    ):
+        """Yield the ``(name, value)`` pairs of :meth:`get_sql_data` one by one.
+
+        Nested plain :class:`JDict` children are flattened in place rather
+        than through an intermediate dict per level.
+
+        Args:
+            prefix: String prepended to every yielded name.
+        """
         for k, v in self.data.items():
-            if v.used or show_unused:
-                sql_data = v.get_sql_data(show_unused, show_invisible, return_schema)
-                if isinstance(sql_data, dict):
-                    for k2, v2 in sql_data.items():
-                        sql_dict[k + REF_SEP + k2] = v2
-                elif not isinstance(sql_data, InvisibleParam):
-                    sql_dict[k] = sql_data
-        return sql_dict
+            if not (v.used or show_unused):
+                continue
+            # Hidden children would only hand themselves back; skip the call.
+            if not show_invisible and isinstance(v, InvisibleParam):
+                continue
+            if type(v).get_sql_data is JDict.get_sql_data:
+                yield from v.iter_sql_data(
+                    show_unused, show_invisible, return_schema, prefix + k + REF_SEP
+                )
+                continue
+            sql_data = v.get_sql_data(show_unused, show_invisible, return_schema)
+            if isinstance(sql_data, dict):
+                child_prefix = prefix + k + REF_SEP
+                for k2, v2 in sql_data.items():
+                    yield child_prefix + k2, v2
+            elif not isinstance(sql_data, InvisibleParam):
+                yield prefix + k, sql_data
 
     def merge_dtypes(self, other: "JDict"):
         """Propagate dtype information from another :class:`JDict`."""
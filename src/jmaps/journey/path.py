@@ -170,6 +170,36 @@ class JPath(ABC, BaseModel):
             "batch environments defined by this parent path."
         ),
     )
+    subpath_workers: int = Field(
+        1,
+        description=(
+            "Number of threads used to run the non-batched subpaths. With more "
+            "than one, those subpaths run concurrently, each on its own copy of "
+            "the environment, before the batched subpaths; get_batch is then "
+            "only called for batched subpaths. Only use this if the subpaths "
+            "are thread safe. Runs with plot=True stay sequential if any of "
+            "these subpaths, or their own subpaths, override plot."
+        ),
+    )
+    batch_workers: int = Field(
+        1,
+        description=(
+            "Number of threads used to run the elements of each batched "
+            "subpath. With more than one, elements run concurrently, each on its "
+            "own copy of the environment. Only use this if the batched subpaths "
+            "are thread safe. Runs with plot=True stay sequential if a batched "
+            "subpath, or one of its own subpaths, overrides plot."
+        ),
+    )
+    copy_env: bool = Field(
+        True,
+        description=(
+            "Whether Journey.run gives this path a private deep copy of the "
+            "journey environment. If false, the journey environment is used "
+            "directly, so run state (parameter usage, Refer targets and Buffer "
+            "values, including NEVER-reset ones) persists on it between runs."
+        ),
+    )
 
     @abstractmethod
     def _run(self, env: JDict, subpath_results: dict[str, Any], verbose: bool = False) -> PathResult: